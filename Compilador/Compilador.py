@@ -1,15 +1,39 @@
 from ply import lex, yacc
-import tkinter as tk
-from tkinter import filedialog, messagebox
-from PIL import Image, ImageTk
+from array import array
+import codecs
+import collections
+import contextlib
+import copy
+import functools
+import gc
+import hashlib
+import io
+import itertools
+import json
+import mmap
 import os
 import re
+import sys
+import threading
+import time
+import types
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
 
 # ----------------------------
 # Configuración de rutas
 # ----------------------------
 RUTA_SALIDA_ALTERNATIVA = r"D:\VisualStudioCode\Compilador"
 
+# Directorio donde se guardan las tablas LALR ya generadas. Se puede cambiar
+# con la variable de entorno COMPILADOR_CACHE.
+DIRECTORIO_CACHE = os.environ.get('COMPILADOR_CACHE') or os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+    'compilador')
+
 # ----------------------------
 # Analizador Léxico 
 # ----------------------------
@@ -75,15 +99,13 @@ def t_COMENTARIO(t):
     t.lexer.lineno += t.value.count('\n')  # Contar líneas en comentarios multilínea
     pass  # Ignorar completamente los comentarios
 
-errores_lexicos = []
-
 def t_TEXTO(t):
     r'["“][^"”]*["”]'
     # Verificar balanceo de comillas
     if (t.value[0] == '"' and t.value[-1] != '"') or \
        (t.value[0] == '“' and t.value[-1] != '”'):
         t.type = 'TEXTO_MAL_FORMADO'
-        errores_lexicos.append({
+        t.lexer.errores_lexicos.append({
             'line': t.lineno,
             'value': t.value,
             'type': t.type,
@@ -98,7 +120,7 @@ def t_IDENTIFICADOR(t):
     # Verificar si contiene caracteres no permitidos
     if any(not (c.isalnum() or c == '_') for c in t.value):
         t.type = 'ERROR_IDENTIFICADOR'
-        errores_lexicos.append({
+        t.lexer.errores_lexicos.append({
             'line': t.lineno,
             'value': t.value,
             'type': t.type,
@@ -106,6 +128,8 @@ def t_IDENTIFICADOR(t):
         })
         return t
     
+    # Los nombres se repiten mucho: se internan para compartir una sola copia
+    t.value = sys.intern(t.value)
     t.type = reserved.get(t.value, 'IDENTIFICADOR')
     return t
 
@@ -119,17 +143,27 @@ def t_newline(t):
     t.lexer.lineno += len(t.value)
     # No retornamos el token para que no aparezca en la salida
 
+# Un error léxico se extiende hasta el siguiente espacio o separador
+_FIN_ERROR_LEXICO = re.compile(r'[^\s()=+\-*/;:,]*')
+
+def t_ERROR_LEXICO(t):
+    r'[^a-zA-Z_áéíóúÁÉÍÓÚñÑ\d“”"+\-*/=(),;:\s][^\s()=+\-*/;:,]*'
+    # Caracteres que ninguna otra regla acepta; equivale a t_error pero
+    # evita que PLY copie el resto del texto en cada error
+    t.lexer.errores_lexicos.append({
+        'line': t.lineno,
+        'value': t.value,
+        'type': 'ERROR_LEXICO',
+        'msg': f'Carácter no permitido: "{t.value}"'
+    })
+    return t
+
 def t_error(t):
-    # Capturar el token inválido
-    remaining = t.lexer.lexdata[t.lexer.lexpos:]
-    end = 0
-    while end < len(remaining) and not remaining[end].isspace() and remaining[end] not in '()=+-*/;:,':
-        end += 1
-    
-    invalid = remaining[:end]
-    t.lexer.lexpos += end
+    # Capturar el token inválido (se busca sobre el texto, sin copiarlo)
+    invalid = _FIN_ERROR_LEXICO.match(t.lexer.lexdata, t.lexer.lexpos).group()
+    t.lexer.lexpos += len(invalid)
     
-    errores_lexicos.append({
+    t.lexer.errores_lexicos.append({
         'line': t.lineno,
         'value': invalid,
         'type': 'ERROR_LEXICO',
@@ -140,17 +174,162 @@ def t_error(t):
     t.value = invalid
     return t
 
+# Lexer prototipo: cada sesión trabaja con un clon propio
 lexer = lex.lex()
+lexer.errores_lexicos = []
+
+# ----------------------------
+# Analizador léxico rápido
+#
+# Mismos tokens, valores, líneas y errores que las reglas de PLY, pero con
+# una sola expresión maestra recorrida con finditer: sin una llamada a
+# función por regla ni un LexToken con __dict__ por token.
+# ----------------------------
+
+class TokenLexico:
+    # Equivalente a lex.LexToken sin __dict__ ('lexer' lo asigna yacc al
+    # informar errores)
+    __slots__ = ('type', 'value', 'lineno', 'lexpos', 'lexer')
+
+    def __init__(self, tipo, valor, linea, posicion):
+        self.type = tipo
+        self.value = valor
+        self.lineno = linea
+        self.lexpos = posicion
+
+    def __repr__(self):
+        return f"LexToken({self.type},{self.value!r},{self.lineno},{self.lexpos})"
+
+# Las reglas van en el orden en que PLY las prueba: primero los caracteres
+# ignorados, luego las funciones en orden de definición y por último las
+# cadenas de mayor a menor longitud. t_TEXTO se omite porque nunca llega a
+# coincidir (t_COMILLA_IZQ acepta antes cualquiera de sus comillas).
+_CADENAS_LEXICAS = sorted(
+    ((nombre[2:], regla) for nombre, regla in list(globals().items())
+     if nombre.startswith('t_') and nombre != 't_ignore' and isinstance(regla, str)),
+    key=lambda regla: len(regla[1]), reverse=True)
+
+# Los caracteres ignorados se consumen delante de cada token, dentro de la
+# misma coincidencia
+_EXPRESION_MAESTRA = re.compile(f'[{re.escape(t_ignore)}]*(?:' + '|'.join(
+    f'(?P<{nombre}>{regla})' for nombre, regla in [
+        ('COMILLA_IZQ', t_COMILLA_IZQ.__doc__),
+        ('COMILLA_DER', t_COMILLA_DER.__doc__),
+        ('COMENTARIO', t_COMENTARIO.__doc__),
+        ('IDENTIFICADOR', t_IDENTIFICADOR.__doc__),
+        ('CONSTANTE', t_CONSTANTE.__doc__),
+        ('SALTO', t_newline.__doc__),
+        ('ERROR_LEXICO', t_ERROR_LEXICO.__doc__),
+    ] + _CADENAS_LEXICAS + [
+        ('INVALIDO', r'[\s\S]'),  # Espacios que ninguna regla acepta ('\r', '\f', ...)
+    ]) + '|$)', re.VERBOSE)
+
+# Tipo de token de cada grupo (por número) cuyo tipo no depende del valor
+_GRUPOS_LEXICOS = _EXPRESION_MAESTRA.groupindex
+_TIPOS_FIJOS = [None] * (_EXPRESION_MAESTRA.groups + 1)
+for _nombre in ['COMILLA_IZQ', 'COMILLA_DER'] + [nombre for nombre, _ in _CADENAS_LEXICAS]:
+    _TIPOS_FIJOS[_GRUPOS_LEXICOS[_nombre]] = _nombre
+
+class LexerRapido:
+    # Misma interfaz que el lexer de PLY que usa el compilador: input(),
+    # token(), clone(), iteración, lineno y errores_lexicos
+    def __init__(self):
+        self.lexdata = ''
+        self.lexpos = 0
+        self.lineno = 1
+        self.errores_lexicos = []
+        self._tokens = iter(())
+
+    def clone(self):
+        copia = LexerRapido()
+        copia.lineno = self.lineno
+        copia.errores_lexicos = self.errores_lexicos
+        return copia
+
+    def input(self, data):
+        self.lexdata = data
+        self.lexpos = 0
+        self._tokens = self._generar()
+
+    def token(self):
+        return next(self._tokens, None)
+
+    def __iter__(self):
+        return self._tokens
+
+    def _generar(self):
+        datos = self.lexdata
+        errores = self.errores_lexicos
+        linea = self.lineno
+        fijos = _TIPOS_FIJOS
+        reservadas = reserved
+        intern = sys.intern
+        # Se despacha por número de grupo (más rápido que por nombre)
+        IDENTIFICADOR, SALTO, CONSTANTE, COMENTARIO, ERROR_LEXICO, INVALIDO = (
+            _GRUPOS_LEXICOS[nombre] for nombre in
+            ('IDENTIFICADOR', 'SALTO', 'CONSTANTE', 'COMENTARIO', 'ERROR_LEXICO', 'INVALIDO'))
+
+        for m in _EXPRESION_MAESTRA.finditer(datos, self.lexpos):
+            grupo = m.lastindex or 0  # Sin grupo: solo quedaban caracteres ignorados
+            tipo = fijos[grupo]
+            if tipo is not None:
+                yield TokenLexico(tipo, m[grupo], linea, m.start(grupo))
+            elif grupo == IDENTIFICADOR:
+                valor = intern(m[grupo])
+                yield TokenLexico(reservadas.get(valor, 'IDENTIFICADOR'), valor, linea, m.start(grupo))
+            elif grupo == SALTO:
+                linea += m.end() - m.start(grupo)
+                self.lineno = linea
+            elif grupo == CONSTANTE:
+                yield TokenLexico('CONSTANTE', int(m[grupo]), linea, m.start(grupo))
+            elif grupo == COMENTARIO:
+                if datos[m.end() - 1] == '\n':
+                    linea += 1
+                    self.lineno = linea
+            elif grupo == ERROR_LEXICO:
+                valor = m[grupo]
+                errores.append({
+                    'line': linea,
+                    'value': valor,
+                    'type': 'ERROR_LEXICO',
+                    'msg': f'Carácter no permitido: "{valor}"'
+                })
+                yield TokenLexico('ERROR_LEXICO', valor, linea, m.start(grupo))
+            elif grupo == INVALIDO:
+                # Como t_error: el error no avanza y PLY aborta el análisis
+                posicion = m.start(grupo)
+                self.lexpos = posicion
+                errores.append({
+                    'line': linea,
+                    'value': '',
+                    'type': 'ERROR_LEXICO',
+                    'msg': 'Carácter no permitido: ""'
+                })
+                raise lex.LexError(f"Scanning error. Illegal character '{datos[posicion]}'",
+                                   datos[posicion:])
+        self.lexpos = len(datos)
+
+lexer_rapido = LexerRapido()
+
+# Motores léxicos disponibles para SesionCompilador
+MOTORES_LEXICOS = {'ply': lexer, 'rapido': lexer_rapido}
 
 # ----------------------------
 # Analizador Sintáctico
 # ----------------------------
 
 class Nodo:
-    def __init__(self, tipo, hijos=None, valor=None):
+    # Sin __dict__ por instancia; las hojas comparten una tupla vacía como
+    # lista de hijos. Los tipos son literales del código (ya internados).
+    # `linea`: renglón del token de IDs, números y operaciones (para los
+    # diagnósticos semánticos); None en el resto.
+    __slots__ = ('tipo', 'hijos', 'valor', 'linea')
+
+    def __init__(self, tipo, hijos=None, valor=None, linea=None):
         self.tipo = tipo
-        self.hijos = hijos if hijos is not None else []
+        self.hijos = hijos if hijos is not None else ()
         self.valor = valor
+        self.linea = linea
 
     def __repr__(self):
         return f"{self.tipo}({self.valor})" if self.valor else self.tipo
@@ -172,10 +351,12 @@ def p_encabezado(p):
 def p_declaraciones(p):
     '''declaraciones : declaracion
                     | declaraciones declaracion'''
+    # Un solo nodo DECLARACIONES con todas las declaraciones como hijos
     if len(p) == 2:
         p[0] = Nodo('DECLARACIONES', [p[1]])
     else:
-        p[0] = Nodo('DECLARACIONES', [p[1], p[2]])
+        p[0] = p[1]
+        p[0].hijos.append(p[2])
 
 def p_declaracion(p):
     '''declaracion : tipo lista_ids PUNTOYCOMA
@@ -185,18 +366,25 @@ def p_declaracion(p):
     else:
         p[0] = Nodo('DECLARACION_CON_INICIALIZACION', [
             p[1],
-            Nodo('ID', valor=p[2]),
+            Nodo('ID', valor=p[2], linea=p.lineno(2)),
             p[4]
         ])
 
+def p_declaracion_error(p):
+    '''declaracion : error PUNTOYCOMA
+                  | error'''
+    # Declaración irreconocible (ver p_instruccion_error)
+    p.parser.errok()
+    p[0] = Nodo('ERROR', linea=p.lineno(1))
+
 def p_lista_ids(p):
     '''lista_ids : IDENTIFICADOR
                 | lista_ids COMA IDENTIFICADOR'''
     if len(p) == 2:
-        p[0] = Nodo('LISTA_IDS', [Nodo('ID', valor=p[1])])
+        p[0] = Nodo('LISTA_IDS', [Nodo('ID', valor=p[1], linea=p.lineno(1))])
     else:
         p[0] = p[1]
-        p[0].hijos.append(Nodo('ID', valor=p[3]))
+        p[0].hijos.append(Nodo('ID', valor=p[3], linea=p.lineno(3)))
 
 def p_tipo(p):
     '''tipo : INT
@@ -211,10 +399,12 @@ def p_bloque(p):
 def p_instrucciones(p):
     '''instrucciones : instruccion
                     | instrucciones instruccion'''
+    # Un solo nodo INSTRUCCIONES con todas las instrucciones como hijos
     if len(p) == 2:
         p[0] = Nodo('INSTRUCCIONES', [p[1]])
     else:
-        p[0] = Nodo('INSTRUCCIONES', [p[1], p[2]])
+        p[0] = p[1]
+        p[0].hijos.append(p[2])
 
 def p_instruccion(p):
     '''instruccion : impresion
@@ -222,22 +412,31 @@ def p_instruccion(p):
                   | asignacion'''
     p[0] = p[1]
 
+def p_instruccion_error(p):
+    '''instruccion : error PUNTOYCOMA
+                  | error'''
+    # Instrucción irreconocible (la recuperación ya informó el error).
+    # errok(): el siguiente error se informa y se recupera igual, aunque
+    # ocurra antes de desplazar tres tokens
+    p.parser.errok()
+    p[0] = Nodo('ERROR', linea=p.lineno(1))
+
 def p_impresion_texto(p):
     '''impresion : IMPCAD PAREN_IZQ TEXTO PAREN_DER PUNTOYCOMA'''
     p[0] = Nodo('IMPRIMIR', [Nodo('TEXTO', valor=p[3])])
 
 def p_impresion_id(p):
     '''impresion : IMPCAD PAREN_IZQ IDENTIFICADOR PAREN_DER PUNTOYCOMA'''
-    p[0] = Nodo('IMPRIMIR', [Nodo('ID', valor=p[3])])
+    p[0] = Nodo('IMPRIMIR', [Nodo('ID', valor=p[3], linea=p.lineno(3))])
 
 def p_lectura(p):
     '''lectura : LEERDIG PAREN_IZQ IDENTIFICADOR PAREN_DER PUNTOYCOMA'''
-    p[0] = Nodo('LEER', [Nodo('ID', valor=p[3])])
+    p[0] = Nodo('LEER', [Nodo('ID', valor=p[3], linea=p.lineno(3))])
 
 def p_asignacion(p):
     '''asignacion : IDENTIFICADOR ASIGNACION expresion PUNTOYCOMA'''
     p[0] = Nodo('ASIGNACION', [
-        Nodo('ID', valor=p[1]),
+        Nodo('ID', valor=p[1], linea=p.lineno(1)),
         p[3]
     ])
 
@@ -246,7 +445,7 @@ def p_expresion_binaria(p):
                 | expresion RESTA expresion
                 | expresion MULTIPLICACION expresion
                 | expresion DIVISION expresion'''
-    p[0] = Nodo(p[2], [p[1], p[3]])
+    p[0] = Nodo(p[2], [p[1], p[3]], linea=p.lineno(2))
 
 def p_expresion_parentesis(p):
     'expresion : PAREN_IZQ expresion PAREN_DER'
@@ -254,136 +453,587 @@ def p_expresion_parentesis(p):
 
 def p_expresion_identificador(p):
     'expresion : IDENTIFICADOR'
-    p[0] = Nodo('ID', valor=p[1])
+    p[0] = Nodo('ID', valor=p[1], linea=p.lineno(1))
 
 def p_expresion_numero(p):
     'expresion : CONSTANTE'
-    p[0] = Nodo('NUMERO', valor=p[1])
+    p[0] = Nodo('NUMERO', valor=p[1], linea=p.lineno(1))
 
 def p_error(p):
-    if p:
-        print(f"Error de sintaxis en línea {p.lineno}: Token inesperado '{p.value}'")
-        # Recuperación: saltar hasta el siguiente punto y coma
-        parser.errok()
-        # Leer siguiente token
-        token = parser.token()
+    return recuperar_error_sintaxis(parser, p)
+
+# ----------------------------
+# Recuperación de errores sintácticos (modo pánico)
+#
+# Al primer token inesperado se descarta todo hasta el siguiente token de
+# sincronización (';', el Inicio de las declaraciones o el Fin final) sin
+# pasar por el parser; después yacc saca de la pila la declaración o
+# instrucción a medias y la reemplaza por un nodo ERROR (producciones con
+# `error`). Cada declaración o instrucción rota da un solo diagnóstico; lo
+# que sobre después de un programa completo se descarta.
+# ----------------------------
+
+class LimiteErroresAlcanzado(Exception):
+    def __init__(self, limite):
+        super().__init__(f"Análisis detenido: se alcanzó el límite de {limite} "
+                         f"errores sintácticos")
+
+def recuperar_error_sintaxis(parser_activo, p, errores=None, limite=None):
+    # `errores`: lista donde se agregan los diagnósticos; con `limite`, al
+    # llegar a esa cantidad se detiene el análisis con LimiteErroresAlcanzado
+    if errores is not None:
+        errores.append({
+            'line': p.lineno if p else None,
+            'value': p.value if p else None,
+            'type': p.type if p else '$end',
+            'msg': 'Token inesperado' if p else 'Fin de archivo inesperado'
+        })
+        if limite is not None and len(errores) >= limite:
+            raise LimiteErroresAlcanzado(limite)
+    if p is None:
+        return
+    if len(parser_activo.symstack) == 2 and parser_activo.symstack[-1].type == 'programa':
+        # Tokens después de un programa completo (p. ej. un Fin suelto que
+        # cerró el bloque antes de tiempo): se descartan y se conserva el árbol
+        while parser_activo.token() is not None:
+            pass
+        parser_activo.errok()
+        return None
+    en_bloque = any(simbolo.type == 'PALABRA_RESERVADA_INICIO'
+                    for simbolo in parser_activo.symstack)
+    token = p
+    while token is not None:
+        tipo = token.type
+        if tipo == 'PUNTOYCOMA' or (tipo == 'PALABRA_RESERVADA_INICIO' and not en_bloque):
+            break
+        siguiente = parser_activo.token()
+        if tipo == 'PALABRA_RESERVADA_FIN' and siguiente is None:
+            # Solo el último Fin: uno seguido de más tokens puede ser, p. ej.,
+            # parte de un texto entre comillas tipográficas
+            break
+        token = siguiente
+    if token is None or token is p:
+        return
+    if parser_activo.symstack[-1].type == 'error':
+        # El error ocurrió con `error` ya en la pila: yacc descartaría el
+        # token, así que se continúa directamente desde el de sincronización
+        parser_activo.errok()
         return token
-    else:
-        print("Error de sintaxis al final del archivo")
+    # yacc vuelve a leer el token del error después de desplazar `error`:
+    # se convierte en el de sincronización (conserva el renglón del error
+    # para el nodo ERROR)
+    p.type, p.value = token.type, token.value
+
+def firma_gramatica(inicio=None):
+    # Hash de todo lo que determina las tablas: tokens, precedencia,
+    # símbolo inicial y las producciones (docstrings de las funciones p_*)
+    h = hashlib.sha256()
+    h.update(yacc.__tabversion__.encode())
+    h.update(repr(inicio).encode('utf-8'))
+    h.update(repr(tokens).encode('utf-8'))
+    h.update(repr(precedence).encode('utf-8'))
+    reglas = [f for nombre, f in globals().items()
+              if nombre.startswith('p_') and nombre != 'p_error' and isinstance(f, types.FunctionType)]
+    for f in sorted(reglas, key=lambda f: f.__code__.co_firstlineno):
+        h.update(f.__name__.encode('utf-8'))
+        h.update((f.__doc__ or '').encode('utf-8'))
+    return h.hexdigest()[:20]
+
+@functools.lru_cache(maxsize=None)
+def version_compilador():
+    # Identifica al compilador completo (lexer, gramática, generadores de
+    # archivos y pases de optimización, que usan maquina_virtual.dividir):
+    # cualquier cambio en estos módulos invalida los resultados guardados
+    # en caché
+    h = hashlib.sha256()
+    h.update(yacc.__tabversion__.encode())
+    directorio = os.path.dirname(os.path.abspath(__file__))
+    for modulo in (__file__, 'optimizador.py', 'maquina_virtual.py'):
+        with open(os.path.join(directorio, os.path.basename(modulo)), 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()[:20]
+
+def construir_parser(directorio_cache=None, inicio=None):
+    # Carga las tablas LALR desde la caché; solo si no existen (o la
+    # gramática cambió) se generan y se guardan de forma atómica.
+    # `inicio` permite construir un parser para otro símbolo (p. ej.
+    # 'instruccion') con la misma gramática.
+    directorio_cache = directorio_cache or DIRECTORIO_CACHE
+    ruta_tablas = os.path.join(directorio_cache, f'parsetab_{firma_gramatica(inicio)}.pickle')
+
+    if os.path.exists(ruta_tablas):
+        try:
+            return yacc.yacc(debug=False, optimize=True, picklefile=ruta_tablas,
+                             errorlog=yacc.NullLogger())
+        except Exception:
+            pass  # Archivo dañado o de otra versión: se regenera
+
+    try:
+        os.makedirs(directorio_cache, exist_ok=True)
+        temporal = f'{ruta_tablas}.{os.getpid()}.tmp'
+        nuevo_parser = yacc.yacc(debug=False, start=inicio, picklefile=temporal,
+                                 errorlog=yacc.NullLogger())
+        os.replace(temporal, ruta_tablas)
+        return nuevo_parser
+    except OSError:
+        # Sin permisos de escritura: se usan las tablas en memoria
+        return yacc.yacc(debug=False, start=inicio, write_tables=False,
+                         errorlog=yacc.NullLogger())
+
+parser = construir_parser()
+
+class FuenteTokens:
+    # Adaptador con la interfaz de lexer que espera yacc: entrega al parser
+    # los tokens ya obtenidos en lugar de volver a analizar el texto
+    def __init__(self, tokens):
+        self._tokens = iter(tokens)
+
+    def input(self, data):
+        pass
 
-parser = yacc.yacc()
+    def token(self):
+        return next(self._tokens, None)
 
 # ----------------------------
-# Funciones para generación de archivos
+# Tabla de tokens
+#
+# Los tokens analizados se guardan por columnas: el código de tipo en un
+# array('H'), el renglón en un array('I') y el lexema (cadena internada o
+# constante entera) en una lista. Unos 14 bytes por token en lugar de un
+# diccionario por token.
 # ----------------------------
 
-def generar_archivo_tok(tokens_analizados, output_dir):
-    ruta_completa = os.path.join(output_dir, 'progfte.tok')
-    with open(ruta_completa, 'w', encoding='utf-8') as f:
-        for token in tokens_analizados:
-            line = f"Renglón: {token['line']:<7} Lexema: {token['value']:<15} Token: {token['type']}"
-            
-            if token['type'] in ['ERROR_LEXICO', 'ERROR_IDENTIFICADOR', 'TEXTO_MAL_FORMADO']:
-                error_info = next((e for e in errores_lexicos if e['value'] == token['value'] and e['line'] == token['line']), None)
-                if error_info:
-                    line += f" (Error: {error_info.get('msg', 'Error léxico')})"
-            
-            f.write(line + "\n")
+# Códigos de referencia de progfte.tab
+CODIGOS_TOKEN = {
+    'IDENTIFICADOR': 300,
+    'CONSTANTE': 400,
+    'PALABRA_RESERVADA_INICIO': 1,
+    'PALABRA_RESERVADA_FIN': 2,
+    'IMPCAD': 11,
+    'LEERDIG': 13,
+    'PAREN_IZQ': 50,
+    'PAREN_DER': 51,
+    'SUMA': 60,
+    'RESTA': 61,
+    'MULTIPLICACION': 62,
+    'DIVISION': 63,
+    'IGUAL': 70,
+    'COMA': 80,
+    'PUNTOYCOMA': 81,
+    'DOSPUNTOS': 82,
+    'TEXTO': 500,
+    'COMILLA_IZQ': 83,
+    'COMILLA_DER': 84,
+    'INT': 201,
+    'CAD': 202,
+    'BOOL': 203,
+    'ASIGNACION': 90
+}
 
-def generar_archivo_tab(tokens_analizados, output_dir):
-    # Filtramos los tokens de error para no mostrarlos en la tabla
-    tokens_validos = [t for t in tokens_analizados if not t['type'].startswith('ERROR_') and t['type'] != 'TEXTO_MAL_FORMADO']
-    
-    token_codes = {
-        'IDENTIFICADOR': 300,
-        'CONSTANTE': 400,
-        'PALABRA_RESERVADA_INICIO': 1,
-        'PALABRA_RESERVADA_FIN': 2,
-        'IMPCAD': 11,
-        'LEERDIG': 13,
-        'PAREN_IZQ': 50,
-        'PAREN_DER': 51,
-        'SUMA': 60,
-        'RESTA': 61,
-        'MULTIPLICACION': 62,
-        'DIVISION': 63,
-        'IGUAL': 70,
-        'COMA': 80,
-        'PUNTOYCOMA': 81,
-        'DOSPUNTOS': 82,
-        'TEXTO': 500,
-        'COMILLA_IZQ': 83,
-        'COMILLA_DER': 84,
-        'INT': 201,
-        'CAD': 202,
-        'BOOL': 203,
-        'ASIGNACION': 90
-    }
-    
-    ruta_completa = os.path.join(output_dir, 'progfte.tab')
-    with open(ruta_completa, 'w', encoding='utf-8') as f:
-        f.write("{:<8} {:<20} {:<50} {:<15}\n".format(
-            "No", "Lexema", "Token", "Referencia"))
-        f.write("-"*93 + "\n")
-        for i, token in enumerate(tokens_validos, 1):
-            f.write("{:<8} {:<20} {:<50} {:<15}\n".format(
-                i, token['value'], token['type'], token_codes.get(token['type'], 999)))
+# Los tipos de error no aparecen en progfte.tab; en la tabla de tokens
+# reciben códigos propios
+_CODIGO_TIPO = dict(CODIGOS_TOKEN, ERROR_IDENTIFICADOR=997, TEXTO_MAL_FORMADO=998,
+                    ERROR_LEXICO=999)
+# Nombre del tipo indexado por código (lista: más rápida que un dict)
+_TIPO_CODIGO = [None] * (max(_CODIGO_TIPO.values()) + 1)
+for _tipo, _codigo in _CODIGO_TIPO.items():
+    _TIPO_CODIGO[_codigo] = _tipo
+CODIGOS_ERROR = frozenset(_CODIGO_TIPO[tipo] for tipo in
+                          ('ERROR_IDENTIFICADOR', 'TEXTO_MAL_FORMADO', 'ERROR_LEXICO'))
+
+class TablaTokens:
+    def __init__(self):
+        self.codigos = array('H')
+        self.lineas = array('I')
+        self.valores = []
+
+    def agregar(self, tipo, valor, linea):
+        self.codigos.append(_CODIGO_TIPO[tipo])
+        self.lineas.append(linea)
+        self.valores.append(sys.intern(valor) if type(valor) is str else valor)
+
+    def registrar(self, tokens_lexer):
+        # Guarda cada token según pasa hacia el parser, sin retenerlo
+        agregar = self.agregar
+        for tok in tokens_lexer:
+            agregar(tok.type, tok.value, tok.lineno)
+            yield tok
+
+    def extender(self, otra):
+        self.codigos.extend(otra.codigos)
+        self.lineas.extend(otra.lineas)
+        self.valores.extend(otra.valores)
+
+    def __len__(self):
+        return len(self.codigos)
+
+    def __iter__(self):
+        # Vista ligera: tuplas (tipo, lexema, renglón)
+        return zip(map(_TIPO_CODIGO.__getitem__, self.codigos), self.valores, self.lineas)
+
+    def tokens(self):
+        # Tokens para el parser leídos directamente de las columnas
+        return map(TokenLexico, map(_TIPO_CODIGO.__getitem__, self.codigos),
+                   self.valores, self.lineas, itertools.repeat(0))
+
+    def __eq__(self, otra):
+        if not isinstance(otra, TablaTokens):
+            return NotImplemented
+        return (self.codigos == otra.codigos and self.lineas == otra.lineas
+                and self.valores == otra.valores)
+
+    def tipo(self, i):
+        return _TIPO_CODIGO[self.codigos[i]]
+
+    def valor(self, i):
+        return self.valores[i]
+
+    def linea(self, i):
+        return self.lineas[i]
+
+    def como_diccionarios(self):
+        # Representación serializable a JSON (una entrada por token)
+        return [{'type': tipo, 'value': valor, 'line': linea} for tipo, valor, linea in self]
 
-def generar_depuracion(tokens_analizados, output_dir):
-    depurado = []
-    i = 0
-    n = len(tokens_analizados)
-    fin_encontrado = False
+# ----------------------------
+# Lectura de fuentes
+#
+# El archivo se proyecta en memoria (mmap) y se decodifica por bloques que
+# terminan en un salto de línea. Ningún token cruza un renglón, así que el
+# lexer analiza cada bloque por separado y el texto completo nunca llega a
+# existir como str. Tuberías, stdin y archivos que no se pueden proyectar
+# se leen por bloques.
+# ----------------------------
 
-    while i < n and not fin_encontrado:
-        token = tokens_analizados[i]
+TAMANO_BLOQUE = 1 << 20
 
-        if token['type'] == 'PALABRA_RESERVADA_FIN':
-            fin_encontrado = True
-            depurado.append('Fin')
+def _normalizar_saltos(texto):
+    # Igual que abrir en modo texto (saltos universales); un bloque nunca
+    # termina entre '\r' y '\n'
+    return texto.replace('\r\n', '\n').replace('\r', '\n')
+
+def bloques_mapeados(datos, tamano_bloque=TAMANO_BLOQUE):
+    # `datos` es un mmap (o bytes); cada bloque se decodifica al pedirlo
+    inicio, total = 0, len(datos)
+    liberado = 0
+    while inicio < total:
+        if inicio + tamano_bloque >= total:
+            fin = total
+        else:
+            fin = datos.rfind(b'\n', inicio, inicio + tamano_bloque) + 1
+            if not fin:
+                # Renglón más largo que el bloque: se toma completo
+                fin = datos.find(b'\n', inicio + tamano_bloque) + 1 or total
+        yield _normalizar_saltos(str(datos[inicio:fin], 'utf-8'))
+        inicio = fin
+        liberado = _liberar_paginas(datos, liberado, inicio)
+
+def _liberar_paginas(datos, desde, hasta):
+    # Las páginas ya decodificadas del mmap dejan de contar en la memoria
+    # residente del proceso (el sistema las vuelve a leer si hace falta)
+    hasta -= hasta % mmap.PAGESIZE
+    if hasta > desde and isinstance(datos, mmap.mmap) and hasattr(mmap, 'MADV_DONTNEED'):
+        datos.madvise(mmap.MADV_DONTNEED, desde, hasta - desde)
+        return hasta
+    return desde
+
+def bloques_flujo(flujo, tamano_bloque=TAMANO_BLOQUE):
+    # `flujo` es binario; lo que queda tras el último salto de línea de cada
+    # lectura pasa al bloque siguiente
+    decodificador = codecs.getincrementaldecoder('utf-8')()
+    pendiente = ''
+    while True:
+        datos = flujo.read(tamano_bloque)
+        texto = pendiente + decodificador.decode(datos, final=not datos)
+        if not datos:
             break
+        corte = texto.rfind('\n') + 1
+        pendiente = texto[corte:]
+        if corte:
+            yield _normalizar_saltos(texto[:corte])
+    if texto:
+        yield _normalizar_saltos(texto)
+
+def _proyectar(f):
+    try:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None  # Archivo vacío, tubería o dispositivo
+
+def bloques_archivo(ruta, tamano_bloque=TAMANO_BLOQUE):
+    with open(ruta, 'rb') as f:
+        datos = _proyectar(f)
+        if datos is None:
+            yield from bloques_flujo(f, tamano_bloque)
+            return
+        with datos:
+            yield from bloques_mapeados(datos, tamano_bloque)
+
+@contextlib.contextmanager
+def proyectar_archivo(ruta):
+    # Contenido completo como objeto de bytes (mmap si es posible), para
+    # calcular hashes sin copiarlo
+    with open(ruta, 'rb') as f:
+        datos = _proyectar(f)
+        if datos is None:
+            yield f.read()
+            return
+        with datos:
+            yield datos
+
+def partir_en_bloques(contenido, tamano_bloque=TAMANO_BLOQUE):
+    # Igual que bloques_mapeados, sobre un texto ya decodificado
+    inicio, total = 0, len(contenido)
+    while inicio < total:
+        if inicio + tamano_bloque >= total:
+            fin = total
+        else:
+            fin = contenido.rfind('\n', inicio, inicio + tamano_bloque) + 1
+            if fin <= inicio:
+                fin = contenido.find('\n', inicio + tamano_bloque) + 1 or total
+        yield contenido[inicio:fin]
+        inicio = fin
 
-        if token['type'] == 'COMENTARIO':
-            i += 1
-            continue
+# ----------------------------
+# Análisis léxico en paralelo
+#
+# Ningún token cruza un renglón: los comentarios terminan en el salto de
+# línea y las comillas son tokens sueltos (t_TEXTO nunca llega a coincidir),
+# así que un literal no puede continuar en el bloque siguiente y cualquier
+# salto de línea es un corte seguro. Cada bloque se lexea en otro proceso
+# empezando en su número de renglón y las tablas se concatenan en orden.
+# ----------------------------
 
-        if token['type'] == 'COMA':
-            depurado.append(',')
-        elif (
-            i + 2 < n and
-            tokens_analizados[i]['type'] == 'IDENTIFICADOR' and
-            tokens_analizados[i+1]['type'] in ['IGUAL', 'ASIGNACION'] and
-            tokens_analizados[i+2]['type'] in ['NUMERO', 'IDENTIFICADOR', 'PARENTESIS_IZQ']
-        ):
-            depurado.append(
-                f"{tokens_analizados[i]['value']}{tokens_analizados[i+1]['value']}{tokens_analizados[i+2]['value']}"
-            )
-            i += 3
-            continue
-        else:
-            depurado.append(str(token['value']))
+def _lexear_bloque(motor_lexico, texto, linea):
+    lexer_bloque = MOTORES_LEXICOS[motor_lexico].clone()
+    lexer_bloque.errores_lexicos = errores = []
+    lexer_bloque.lineno = linea
+    lexer_bloque.input(texto)
+    tabla = TablaTokens()
+    try:
+        for _ in tabla.registrar(lexer_bloque):
+            pass
+    except lex.LexError as e:
+        # LexError no se puede reconstruir al deserializarla: viaja como datos
+        return tabla, errores, (e.args[0], e.text)
+    return tabla, errores, None
+
+def lexear_en_paralelo(bloques, ejecutor, motor_lexico='rapido', en_vuelo=8):
+    # Devuelve (tabla, errores, fallo) de cada bloque en el orden de entrada;
+    # `fallo` son los argumentos de la LexError que lo interrumpió. Como
+    # mucho `en_vuelo` bloques pendientes para no leer toda la entrada antes
+    pendientes = collections.deque()
+    linea = 1
+    for bloque in bloques:
+        pendientes.append(ejecutor.submit(_lexear_bloque, motor_lexico, bloque, linea))
+        linea += bloque.count('\n')
+        if len(pendientes) >= en_vuelo:
+            yield pendientes.popleft().result()
+    while pendientes:
+        yield pendientes.popleft().result()
+
+# ----------------------------
+# Destinos de salida
+# ----------------------------
+
+class SalidaDirectorio:
+    # Escribe los archivos de salida en un directorio del disco
+    def __init__(self, ruta):
+        self.ruta = ruta
+
+    def abrir(self, nombre, binario=False):
+        os.makedirs(self.ruta, exist_ok=True)
+        ruta = os.path.join(self.ruta, nombre)
+        if binario:
+            return open(ruta, 'wb')
+        return open(ruta, 'w', encoding='utf-8')
+
+    def __str__(self):
+        return self.ruta
+
+class _CierreEnMemoria:
+    # Al cerrar, el contenido queda en el diccionario del destino
+    def _registrar(self, archivos, nombre):
+        self._archivos = archivos
+        self._nombre = nombre
+
+    def close(self):
+        if not self.closed:
+            self._archivos[self._nombre] = self.getvalue()
+        super().close()
+
+class _ArchivoMemoria(_CierreEnMemoria, io.StringIO):
+    pass
+
+class _ArchivoMemoriaBinario(_CierreEnMemoria, io.BytesIO):
+    pass
+
+class SalidaMemoria:
+    # Guarda el contenido de cada archivo en el diccionario `archivos`
+    def __init__(self):
+        self.archivos = {}
+
+    def abrir(self, nombre, binario=False):
+        archivo = _ArchivoMemoriaBinario() if binario else _ArchivoMemoria()
+        archivo._registrar(self.archivos, nombre)
+        return archivo
+
+    def __str__(self):
+        return '<memoria>'
+
+def _abrir_salida(salida, nombre, binario=False):
+    # `salida` puede ser la ruta de un directorio o un destino con abrir()
+    if isinstance(salida, (str, os.PathLike)):
+        return SalidaDirectorio(salida).abrir(nombre, binario)
+    return salida.abrir(nombre, binario)
+
+# ----------------------------
+# Funciones para generación de archivos
+# ----------------------------
 
-        i += 1
+# Los tres archivos de tokens se escriben en una sola pasada. Las líneas se
+# acumulan y se escriben de LINEAS_POR_LOTE en LINEAS_POR_LOTE con una
+# única llamada a write (menos llamadas al sistema que una por línea).
+LINEAS_POR_LOTE = 8192
+
+TIPOS_ERROR_LEXICO = ('ERROR_LEXICO', 'ERROR_IDENTIFICADOR', 'TEXTO_MAL_FORMADO')
+
+ARCHIVOS_TOKENS = ('progfte.tok', 'progfte.tab', 'progfte.dep')
+
+def generar_archivos_tokens(tokens_analizados, output_dir, errores_lexicos=(),
+                            archivos=ARCHIVOS_TOKENS):
+    # `tokens_analizados` es cualquier iterable de (tipo, lexema, renglón),
+    # p. ej. una TablaTokens o los tokens según los produce el lexer: el
+    # índice de errores se completa sobre la marcha, porque el lexer
+    # registra cada error antes de entregar su token
+    indice_errores = {}
+    errores_vistos = 0
+
+    tok = 'progfte.tok' in archivos
+    tab = 'progfte.tab' in archivos
+    dep = 'progfte.dep' in archivos
+    lineas_tok, lineas_tab, partes_dep = [], [], []
+    numero_tab = 0
+    # Ventana de 3 tokens para la depuración (asignaciones "a:=b")
+    ventana = collections.deque()
+    fin_encontrado = not dep
+
+    with contextlib.ExitStack() as pila:
+        f_tok = pila.enter_context(_abrir_salida(output_dir, 'progfte.tok')) if tok else None
+        f_tab = pila.enter_context(_abrir_salida(output_dir, 'progfte.tab')) if tab else None
+        f_dep = pila.enter_context(_abrir_salida(output_dir, 'progfte.dep')) if dep else None
+        if tab:
+            lineas_tab.append("{:<8} {:<20} {:<50} {:<15}\n".format(
+                "No", "Lexema", "Token", "Referencia"))
+            lineas_tab.append("-"*93 + "\n")
+
+        for tipo, valor, linea in tokens_analizados:
+            es_error = tipo in TIPOS_ERROR_LEXICO
+
+            if tok:
+                line = f"Renglón: {linea:<7} Lexema: {valor:<15} Token: {tipo}"
+                if es_error:
+                    while errores_vistos < len(errores_lexicos):
+                        e = errores_lexicos[errores_vistos]
+                        indice_errores.setdefault((e['value'], e['line']), e)
+                        errores_vistos += 1
+                    error_info = indice_errores.get((valor, linea))
+                    if error_info:
+                        line += f" (Error: {error_info.get('msg', 'Error léxico')})"
+                lineas_tok.append(line + "\n")
+                if len(lineas_tok) >= LINEAS_POR_LOTE:
+                    f_tok.write(''.join(lineas_tok))
+                    lineas_tok.clear()
+
+            # Los tokens de error no se muestran en la tabla
+            if tab and not es_error:
+                numero_tab += 1
+                lineas_tab.append("{:<8} {:<20} {:<50} {:<15}\n".format(
+                    numero_tab, valor, tipo, CODIGOS_TOKEN.get(tipo, 999)))
+                if len(lineas_tab) >= LINEAS_POR_LOTE:
+                    f_tab.write(''.join(lineas_tab))
+                    lineas_tab.clear()
+
+            if not fin_encontrado:
+                ventana.append((tipo, valor))
+                if len(ventana) == 3:
+                    fin_encontrado = _depurar(ventana, partes_dep)
+                    if len(partes_dep) >= LINEAS_POR_LOTE:
+                        f_dep.write(''.join(partes_dep))
+                        partes_dep.clear()
+
+        while ventana and not fin_encontrado:
+            fin_encontrado = _depurar(ventana, partes_dep)
+
+        if tok:
+            f_tok.write(''.join(lineas_tok))
+        if tab:
+            f_tab.write(''.join(lineas_tab))
+        if dep:
+            f_dep.write(''.join(partes_dep))
+
+def _depurar(ventana, partes):
+    # Decide el primer token de la ventana (con hasta dos de anticipación);
+    # devuelve True al llegar a Fin, donde termina la depuración
+    tipo, valor = ventana[0]
+    if tipo == 'PALABRA_RESERVADA_FIN':
+        partes.append('Fin')
+        return True
+
+    if tipo == 'COMENTARIO':
+        ventana.popleft()
+        return False
+
+    if tipo == 'COMA':
+        partes.append(',')
+    elif (
+        len(ventana) == 3 and
+        tipo == 'IDENTIFICADOR' and
+        ventana[1][0] in ['IGUAL', 'ASIGNACION'] and
+        ventana[2][0] in ['NUMERO', 'IDENTIFICADOR', 'PARENTESIS_IZQ']
+    ):
+        partes.append(f"{valor}{ventana[1][1]}{ventana[2][1]}")
+        ventana.clear()
+        return False
+    else:
+        partes.append(str(valor))
 
-    with open(os.path.join(output_dir, 'progfte.dep'), 'w', encoding='utf-8') as f:
-        f.write(''.join(depurado))
+    ventana.popleft()
+    return False
 
-def generar_arbol_sintactico(arbol, output_dir):
-    def _generar_texto(nodo, nivel=0):
+def generar_archivo_tok(tokens_analizados, output_dir, errores_lexicos=()):
+    generar_archivos_tokens(tokens_analizados, output_dir, errores_lexicos, ('progfte.tok',))
+
+def generar_archivo_tab(tokens_analizados, output_dir):
+    generar_archivos_tokens(tokens_analizados, output_dir, archivos=('progfte.tab',))
+
+def generar_depuracion(tokens_analizados, output_dir):
+    generar_archivos_tokens(tokens_analizados, output_dir, archivos=('progfte.dep',))
+
+def _lineas_arbol(arbol):
+    # Recorrido en preorden con pila explícita (sin límite de profundidad)
+    pendientes = [(arbol, 0)]
+    while pendientes:
+        nodo, nivel = pendientes.pop()
         if nodo is None:
-            return ""
-        texto = "  "*nivel + f"{nodo.tipo}"
+            continue
         if nodo.valor is not None:
-            texto += f": {nodo.valor}"
-        texto += "\n"
-        for hijo in nodo.hijos:
-            texto += _generar_texto(hijo, nivel+1)
-        return texto
-
-    ruta_completa = os.path.join(output_dir, 'progfte.arb')
-    with open(ruta_completa, 'w', encoding='utf-8') as f:
+            yield f"{'  '*nivel}{nodo.tipo}: {nodo.valor}\n"
+        else:
+            yield f"{'  '*nivel}{nodo.tipo}\n"
+        for hijo in reversed(nodo.hijos):
+            pendientes.append((hijo, nivel+1))
+
+def generar_arbol_sintactico(arbol, output_dir):
+    with _abrir_salida(output_dir, 'progfte.arb') as f:
         if arbol is not None:
-            f.write(_generar_texto(arbol))
+            # Las líneas se escriben por lotes, con una llamada a write por lote
+            lineas = _lineas_arbol(arbol)
+            while True:
+                bloque = ''.join(itertools.islice(lineas, LINEAS_POR_LOTE))
+                if not bloque:
+                    break
+                f.write(bloque)
         else:
             f.write("PROGRAMA\n")
             f.write("  ENCABEZADO\n")
@@ -393,56 +1043,1263 @@ def generar_arbol_sintactico(arbol, output_dir):
             f.write("    INSTRUCCIONES\n")
             f.write("\nNOTA: Árbol básico generado debido a errores en el código fuente\n")
 
-def analizar_archivo(file_path):
-    global errores_lexicos
-    errores_lexicos = []
-    
+# ----------------------------
+# Formato binario del árbol (progfte.arbb)
+#
+#   'PFARB' + versión, tabla de cadenas y nodos en preorden:
+#   tipo (índice), clase de valor (0 ninguno, 1 entero, 2 cadena), valor,
+#   renglón (0 si no tiene, si no renglón + 1), número de hijos. Enteros
+#   como varint (con zigzag los de valor).
+# ----------------------------
+
+MAGIA_ARBOL_BINARIO = b'PFARB\x02'
+
+def _escribir_varint(buffer, n):
+    while n > 0x7f:
+        buffer.append((n & 0x7f) | 0x80)
+        n >>= 7
+    buffer.append(n)
+
+def _leer_varint(datos, pos):
+    n = desplazamiento = 0
+    while True:
+        byte = datos[pos]
+        pos += 1
+        n |= (byte & 0x7f) << desplazamiento
+        if byte < 0x80:
+            return n, pos
+        desplazamiento += 7
+
+def serializar_arbol(arbol):
+    cadenas = {}
+    nodos = bytearray()
+
+    def indice(cadena):
+        if cadena not in cadenas:
+            cadenas[cadena] = len(cadenas)
+        return cadenas[cadena]
+
+    total = 0
+    pendientes = [arbol] if arbol is not None else []
+    while pendientes:
+        nodo = pendientes.pop()
+        total += 1
+        _escribir_varint(nodos, indice(nodo.tipo))
+        if nodo.valor is None:
+            nodos.append(0)
+        elif isinstance(nodo.valor, int):
+            nodos.append(1)
+            _escribir_varint(nodos, nodo.valor * 2 if nodo.valor >= 0 else -nodo.valor * 2 - 1)
+        else:
+            nodos.append(2)
+            _escribir_varint(nodos, indice(str(nodo.valor)))
+        _escribir_varint(nodos, 0 if nodo.linea is None else nodo.linea + 1)
+        hijos = [hijo for hijo in nodo.hijos if hijo is not None]
+        _escribir_varint(nodos, len(hijos))
+        pendientes.extend(reversed(hijos))
+
+    datos = bytearray(MAGIA_ARBOL_BINARIO)
+    _escribir_varint(datos, len(cadenas))
+    for cadena in cadenas:
+        codificada = cadena.encode('utf-8')
+        _escribir_varint(datos, len(codificada))
+        datos += codificada
+    _escribir_varint(datos, total)
+    datos += nodos
+    return bytes(datos)
+
+def deserializar_arbol(datos):
+    if not datos.startswith(MAGIA_ARBOL_BINARIO):
+        raise ValueError("No es un árbol binario de pf2024")
+    pos = len(MAGIA_ARBOL_BINARIO)
+
+    cantidad, pos = _leer_varint(datos, pos)
+    cadenas = []
+    for _ in range(cantidad):
+        largo, pos = _leer_varint(datos, pos)
+        cadenas.append(sys.intern(bytes(datos[pos:pos+largo]).decode('utf-8')))
+        pos += largo
+
+    total, pos = _leer_varint(datos, pos)
+    raiz = None
+    abiertos = []  # (nodo, hijos que faltan)
+    for _ in range(total):
+        tipo, pos = _leer_varint(datos, pos)
+        clase = datos[pos]
+        pos += 1
+        valor = None
+        if clase:
+            valor, pos = _leer_varint(datos, pos)
+            if clase == 1:
+                valor = valor >> 1 if not valor & 1 else -((valor + 1) >> 1)
+            else:
+                valor = cadenas[valor]
+        linea, pos = _leer_varint(datos, pos)
+        num_hijos, pos = _leer_varint(datos, pos)
+
+        nodo = Nodo(cadenas[tipo], [] if num_hijos else None, valor, linea - 1 if linea else None)
+        if abiertos:
+            padre, faltan = abiertos[-1]
+            padre.hijos.append(nodo)
+            if faltan == 1:
+                abiertos.pop()
+            else:
+                abiertos[-1] = (padre, faltan - 1)
+        else:
+            raiz = nodo
+        if num_hijos:
+            abiertos.append((nodo, num_hijos))
+    return raiz
+
+def generar_arbol_binario(arbol, output_dir):
+    with _abrir_salida(output_dir, 'progfte.arbb', binario=True) as f:
+        f.write(serializar_arbol(arbol))
+
+def cargar_arbol_binario(ruta):
+    with open(ruta, 'rb') as f:
+        return deserializar_arbol(f.read())
+
+def arbol_a_json(arbol):
+    # Serializa el árbol como JSON anidado ({"tipo", "valor", "hijos"}) sin
+    # recursión: los árboles de programas largos son muy profundos
+    partes = []
+    pendientes = [arbol]
+    while pendientes:
+        nodo = pendientes.pop()
+        if isinstance(nodo, str):
+            partes.append(nodo)
+            continue
+        if nodo is None:
+            partes.append('null')
+            continue
+        partes.append('{"tipo": ' + json.dumps(nodo.tipo, ensure_ascii=False))
+        if nodo.valor is not None:
+            partes.append(', "valor": ' + json.dumps(nodo.valor, ensure_ascii=False))
+        if nodo.hijos:
+            partes.append(', "hijos": [')
+            pendientes.append(']}')
+            for k in range(len(nodo.hijos) - 1, -1, -1):
+                pendientes.append(nodo.hijos[k])
+                if k:
+                    pendientes.append(', ')
+        else:
+            partes.append('}')
+    return ''.join(partes)
+
+# ----------------------------
+# Análisis semántico
+#
+# Una sola pasada sobre el árbol, en el orden del programa: cada
+# declaración agrega su símbolo a la tabla y cada ID se resuelve a su
+# índice con un solo acceso a un dict (los nombres llegan internados desde
+# el lexer). Se informan las variables no declaradas (una vez por nombre),
+# las declaradas dos veces y los tipos incompatibles en := y leerdig. Los
+# diagnósticos tienen la misma forma que los errores léxicos.
+# ----------------------------
+
+class TablaSimbolos:
+    # Columnas paralelas por símbolo; `indices` va del nombre al índice.
+    # `referencias` guarda el símbolo de cada ID del árbol en preorden
+    # (-1 si no está declarado).
+    def __init__(self):
+        self.indices = {}
+        self.nombres = []
+        self.tipos = []
+        self.lineas = []
+        self.usos = []
+        self.referencias = array('i')
+
+    def __len__(self):
+        return len(self.nombres)
+
+    def __contains__(self, nombre):
+        return nombre in self.indices
+
+    def declarar(self, nombre, tipo, linea):
+        indice = len(self.nombres)
+        self.indices[sys.intern(nombre)] = indice
+        self.nombres.append(nombre)
+        self.tipos.append(tipo)
+        self.lineas.append(linea)
+        self.usos.append(0)
+        return indice
+
+    def buscar(self, nombre):
+        return self.indices.get(nombre)
+
+    def tipo(self, nombre):
+        indice = self.indices.get(nombre)
+        return None if indice is None else self.tipos[indice]
+
+class AnalizadorSemantico:
+    def __init__(self, errores=None):
+        self.tabla = TablaSimbolos()
+        self.errores = [] if errores is None else errores
+        self._no_declaradas = set()
+
+    def _error(self, nodo, tipo, mensaje):
+        self.errores.append({
+            'line': nodo.linea,
+            'value': nodo.tipo if nodo.valor is None else nodo.valor,
+            'type': tipo,
+            'msg': mensaje
+        })
+
+    def resolver(self, nodo):
+        # Índice del símbolo del ID (None si no está declarado)
+        tabla = self.tabla
+        indice = tabla.indices.get(nodo.valor)
+        if indice is None:
+            tabla.referencias.append(-1)
+            if nodo.valor not in self._no_declaradas:
+                self._no_declaradas.add(nodo.valor)
+                self._error(nodo, 'VARIABLE_NO_DECLARADA', f'Variable "{nodo.valor}" no declarada')
+            return None
+        tabla.referencias.append(indice)
+        tabla.usos[indice] += 1
+        return indice
+
+    def declarar(self, nodo, tipo):
+        tabla = self.tabla
+        previo = tabla.indices.get(nodo.valor)
+        if previo is not None:
+            # Los usos siguientes se resuelven a la primera declaración
+            self._error(nodo, 'VARIABLE_DUPLICADA',
+                        f'Variable "{nodo.valor}" ya declarada en la línea {tabla.lineas[previo]}')
+            return previo
+        return tabla.declarar(nodo.valor, tipo, nodo.linea)
+
+    def expresion(self, nodo):
+        # Tipo de la expresión, o None si no se puede saber (variable no
+        # declarada u operación inválida, ya informadas). Postorden con una
+        # pila de tipos: en la pila de pendientes, None indica que el nodo
+        # de abajo es una operación con sus operandos ya evaluados.
+        tabla = self.tabla
+        indices, tipos_simbolo, usos, referencias = (tabla.indices, tabla.tipos, tabla.usos,
+                                                     tabla.referencias)
+        tipos = []
+        pendientes = [nodo]
+        while pendientes:
+            nodo = pendientes.pop()
+            if nodo is None:
+                nodo = pendientes.pop()
+                derecha = tipos.pop()
+                izquierda = tipos[-1]
+                if izquierda is None or derecha is None:
+                    tipos[-1] = None
+                elif izquierda != derecha or (izquierda != 'int' and
+                                              (izquierda != 'Cad' or nodo.tipo != '+')):
+                    tipos[-1] = None
+                    self._error(nodo, 'TIPOS_INCOMPATIBLES',
+                                f"Operación '{nodo.tipo}' no válida entre {izquierda} y {derecha}")
+                # Si no, el resultado es del tipo de los operandos
+                continue
+            tipo = nodo.tipo
+            if tipo == 'ID':
+                indice = indices.get(nodo.valor)
+                if indice is None:
+                    tipos.append(self.resolver(nodo))
+                else:
+                    referencias.append(indice)
+                    usos[indice] += 1
+                    tipos.append(tipos_simbolo[indice])
+            elif tipo == 'NUMERO':
+                tipos.append('int')
+            elif tipo in ('+', '-', '*', '/'):
+                pendientes += (nodo, None, nodo.hijos[1], nodo.hijos[0])
+            else:
+                tipos.append(None)  # Nodo desconocido
+        return tipos[-1] if tipos else None
+
+    def asignacion(self, destino, tipo_destino, expresion):
+        tipo = self.expresion(expresion)
+        if tipo_destino is not None and tipo is not None and tipo != tipo_destino:
+            self._error(destino, 'TIPOS_INCOMPATIBLES',
+                        f'No se puede asignar un valor {tipo} a "{destino.valor}" ({tipo_destino})')
+
+    def declaraciones(self, nodo):
+        referencias = self.tabla.referencias
+        for declaracion in nodo.hijos:
+            if declaracion.tipo == 'DECLARACION':
+                tipo, ids = declaracion.hijos
+                for id_ in ids.hijos:
+                    referencias.append(self.declarar(id_, tipo.valor))
+            elif declaracion.tipo == 'DECLARACION_CON_INICIALIZACION':
+                tipo, id_, expresion = declaracion.hijos
+                # La variable todavía no existe dentro de su inicialización:
+                # se declara después, en la posición reservada para su ID
+                posicion = len(referencias)
+                referencias.append(-1)
+                self.asignacion(id_, tipo.valor, expresion)
+                referencias[posicion] = self.declarar(id_, tipo.valor)
+
+    def instruccion(self, nodo):
+        tipo = nodo.tipo
+        if tipo == 'ASIGNACION':
+            destino, expresion = nodo.hijos
+            indice = self.resolver(destino)
+            self.asignacion(destino, None if indice is None else self.tabla.tipos[indice],
+                            expresion)
+        elif tipo == 'LEER':
+            indice = self.resolver(nodo.hijos[0])
+            if indice is not None and self.tabla.tipos[indice] != 'int':
+                self._error(nodo.hijos[0], 'TIPOS_INCOMPATIBLES',
+                            f'leerdig necesita una variable int; "{nodo.hijos[0].valor}" '
+                            f'es {self.tabla.tipos[indice]}')
+        elif tipo == 'IMPRIMIR':
+            if nodo.hijos[0].tipo == 'ID':
+                self.resolver(nodo.hijos[0])
+
+    def programa(self, arbol):
+        for seccion in arbol.hijos:
+            if seccion.tipo == 'DECLARACIONES':
+                self.declaraciones(seccion)
+            elif seccion.tipo == 'BLOQUE':
+                for instrucciones in seccion.hijos:
+                    for nodo in instrucciones.hijos:
+                        self.instruccion(nodo)
+        return self.tabla
+
+def analizar_semantica(arbol, errores=None):
+    # Devuelve la TablaSimbolos; los diagnósticos se agregan a `errores`
+    if arbol is None:
+        return TablaSimbolos()
+    return AnalizadorSemantico(errores).programa(arbol)
+
+# ----------------------------
+# Instrumentación
+#
+# Con una Instrumentacion, la sesión mide cada fase (lectura, léxico,
+# sintáctico y cada generar_*) y ejecuta el léxico y el sintáctico uno
+# tras otro en lugar de intercalados, para poder separar sus tiempos. Sin
+# ella, la sesión no mide nada y sigue el camino normal.
+# ----------------------------
+
+ARCHIVO_ESTADISTICAS = 'progfte.estadisticas.json'
+
+class Instrumentacion:
+    # `ganchos`: funciones gancho(evento, datos) que se llaman al terminar
+    # cada fase ('fase') y cada compilación ('compilacion').
+    # `reporte_json`: escribe ARCHIVO_ESTADISTICAS junto a las salidas.
+    def __init__(self, ganchos=(), reporte_json=False):
+        self.ganchos = list(ganchos)
+        self.reporte_json = reporte_json
+
+def _memoria_maxima_proceso():
+    # Pico de memoria residente de todo el proceso desde que arrancó, en
+    # bytes (no de una compilación: en un proceso que compila varias veces
+    # solo crece)
+    if resource is None:
+        return None
+    maxima = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxima if sys.platform == 'darwin' else maxima * 1024
+
+class EstadisticasCompilacion:
+    def __init__(self, ganchos=()):
+        self.ganchos = ganchos
+        self.fases = {}
+        self.datos = {}
+
+    def _acumular(self, nombre, pared, cpu):
+        fase = self.fases.setdefault(nombre, {'pared': 0.0, 'cpu': 0.0, 'llamadas': 0})
+        fase['pared'] += pared
+        fase['cpu'] += cpu
+        fase['llamadas'] += 1
+        return fase
+
+    @contextlib.contextmanager
+    def fase(self, nombre):
+        pared, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            fase = self._acumular(nombre, time.perf_counter() - pared, time.process_time() - cpu)
+            fase['memoria_maxima_proceso'] = _memoria_maxima_proceso()
+            self._avisar('fase', dict(fase, nombre=nombre))
+
+    def cronometrar(self, nombre, funcion):
+        # Envuelve una función que se llama muchas veces (p. ej. la
+        # recuperación de errores) y acumula su tiempo en una sola fase
+        def medida(*args, **kwargs):
+            pared, cpu = time.perf_counter(), time.process_time()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                self._acumular(nombre, time.perf_counter() - pared, time.process_time() - cpu)
+        return medida
+
+    def _avisar(self, evento, datos):
+        for gancho in self.ganchos:
+            gancho(evento, datos)
+
+    def como_diccionario(self):
+        return dict(self.datos, fases=self.fases)
+
+def contar_nodos(arbol):
+    total = 0
+    pendientes = [arbol] if arbol is not None else []
+    while pendientes:
+        nodo = pendientes.pop()
+        total += 1
+        pendientes.extend(nodo.hijos)
+    return total
+
+# ----------------------------
+# Progreso y cancelación
+#
+# Una sesión con `progreso` publica lo que lleva (bytes entregados al
+# lexer, tokens que pasaron hacia el parser y la fase actual) para que
+# otro hilo lo consulte cuando quiera, p. ej. la interfaz gráfica con
+# root.after. cancelar() detiene la compilación en el siguiente punto de
+# control (cada bloque, cada CADA_TOKENS tokens y al cambiar de fase) con
+# CompilacionCancelada.
+# ----------------------------
+
+class CompilacionCancelada(Exception):
+    pass
+
+class ProgresoCompilacion:
+    CADA_TOKENS = 4096
+
+    def __init__(self):
+        self._cancelado = threading.Event()
+        self.reiniciar()
+
+    def reiniciar(self, bytes_total=0):
+        # Al empezar cada compilación; una cancelación pendiente se conserva
+        self.bytes_total = bytes_total
+        self.bytes_lexeados = 0
+        self.tokens = 0
+        self.fase = None
+
+    def cancelar(self):
+        self._cancelado.set()
+
+    @property
+    def cancelado(self):
+        return self._cancelado.is_set()
+
+    def comprobar(self):
+        if self._cancelado.is_set():
+            raise CompilacionCancelada("Análisis cancelado")
+
+    def iniciar_fase(self, nombre):
+        self.comprobar()
+        self.fase = nombre
+
+    def fraccion(self):
+        # Parte del texto ya lexeada (None si no se conoce el total)
+        if not self.bytes_total:
+            return None
+        return min(1.0, self.bytes_lexeados / self.bytes_total)
+
+_cerrojo_recolector = threading.Lock()
+_pausas_recolector = 0
+_recolector_activo = False
+
+@contextlib.contextmanager
+def sin_recolector():
+    # El árbol y las tablas son millones de objetos sin ciclos; con el
+    # recolector activo, cada pasada completa los recorre todos (segundos
+    # con el GIL tomado, sin que otros hilos avancen). La pausa es de todo
+    # el proceso: con varios hilos (o anidada) se cuenta, y el recolector
+    # vuelve a su estado anterior cuando termina la última
+    global _pausas_recolector, _recolector_activo
+    with _cerrojo_recolector:
+        if not _pausas_recolector:
+            _recolector_activo = gc.isenabled()
+            gc.disable()
+        _pausas_recolector += 1
     try:
-        output_dir = RUTA_SALIDA_ALTERNATIVA
-        os.makedirs(output_dir, exist_ok=True)
-
-        with open(file_path, 'r', encoding='utf-8') as f:
-            contenido = f.read()
-
-        # Reiniciar el contador de líneas
-        lexer.lineno = 1
-        
-        # Procesamiento para tokens
-        lexer.input(contenido)
-        tokens_para_archivos = []
-        while True:
-            tok = lexer.token()
-            if not tok:
-                break
-            tokens_para_archivos.append({
-                'type': tok.type,
-                'value': tok.value,
-                'line': tok.lineno
-            })
+        yield
+    finally:
+        with _cerrojo_recolector:
+            _pausas_recolector -= 1
+            if not _pausas_recolector and _recolector_activo:
+                gc.enable()
 
-        # Parsear el contenido
-        lexer.input(contenido)
-        arbol = parser.parse(contenido, lexer=lexer)
+# ----------------------------
+# Sesión de compilación
+# ----------------------------
+
+class SesionCompilador:
+    # Estado de una compilación: lexer clonado, parser propio (las tablas
+    # LALR se comparten en modo solo lectura), diagnósticos y destino de
+    # salida. Sesiones distintas pueden usarse a la vez desde varios hilos.
+    def __init__(self, output_dir=None, salida=None, arbol_binario=False, cache=None,
+                 motor_lexico='rapido', procesos_lexico=None, instrumentacion=None,
+                 optimizaciones=None, progreso=None, limite_errores=None):
+        if salida is None:
+            salida = SalidaDirectorio(output_dir or RUTA_SALIDA_ALTERNATIVA)
+        self.salida = salida
+        self.arbol_binario = arbol_binario
+        # CacheResultados opcional (ver cache_resultados.py)
+        self.cache = cache
+        self.desde_cache = False
+        self.motor_lexico = motor_lexico
+        self.lexer = MOTORES_LEXICOS[motor_lexico].clone()
+        self.parser = copy.copy(parser)
+        # Con más de un proceso, las entradas de varios bloques se lexean
+        # en paralelo (el pool se crea al usarse y se libera con cerrar())
+        self.procesos_lexico = procesos_lexico
+        self._ejecutor_lexico = None
+        # Instrumentacion opcional; `estadisticas` es la de la última
+        # compilación (None si no se mide)
+        self.instrumentacion = instrumentacion
+        self.estadisticas = None
+        # Pases de optimizador.py que se aplican al árbol tras el análisis
+        # (True: todos); `optimizacion` guarda las estadísticas del último
+        if optimizaciones is True:
+            from optimizador import PASES as optimizaciones
+        self.optimizaciones = tuple(optimizaciones or ())
+        # ProgresoCompilacion opcional, para seguir o cancelar desde otro hilo
+        self.progreso = progreso
+        # Con tantos errores sintácticos se abandona el análisis (None: sin límite)
+        self.limite_errores = limite_errores
+        self._reiniciar()
+
+    def cerrar(self):
+        if self._ejecutor_lexico is not None:
+            self._ejecutor_lexico.shutdown()
+            self._ejecutor_lexico = None
+
+    def _reiniciar(self):
+        self.errores_lexicos = []
+        self.errores_sintacticos = []
+        self.errores_semanticos = []
+        self._simbolos = None
+        self.lexer.errores_lexicos = self.errores_lexicos
+        self.parser.errorfunc = functools.partial(
+            recuperar_error_sintaxis, self.parser, errores=self.errores_sintacticos,
+            limite=self.limite_errores)
+        self.lexer.lineno = 1
+        self.tokens = TablaTokens()
+        self.arbol = None
+        self.optimizacion = None
+
+    def analizar(self, contenido):
+        if self.procesos_lexico and self.procesos_lexico > 1:
+            return self.analizar_bloques(partir_en_bloques(contenido))
+        return self.analizar_bloques((contenido,))
+
+    def analizar_bloques(self, bloques):
+        # `bloques`: textos que terminan en un salto de línea (el último
+        # puede no hacerlo), p. ej. los de bloques_archivo
+        self._nuevas_estadisticas()
+        if self.progreso is not None:
+            self.progreso.reiniciar()
+        return self._analizar(bloques)
+
+    def _analizar(self, bloques):
+        self._reiniciar()
+        if self.estadisticas is not None:
+            return self._analizar_por_fases(bloques)
+
+        # Una sola pasada del lexer: cada token va al parser y queda guardado
+        # en la tabla para los archivos de salida
+        fuente = self._fuente_tokens(bloques)
+        self.arbol = self.parser.parse(lexer=FuenteTokens(fuente))
+        for _ in fuente:
+            pass  # Tokens que el parser no llegó a pedir
+        with self._fase('semantico'):
+            self._analizar_semantica()
+        with self._fase('optimizacion'):
+            self._optimizar()
+        return self.arbol
+
+    def _analizar_por_fases(self, bloques):
+        estadisticas = self.estadisticas
+        with estadisticas.fase('lectura'):
+            bloques = list(bloques)
+        with estadisticas.fase('lexico'):
+            tokens_lexer = list(self._fuente_tokens(bloques))
+        del bloques
+        # El tiempo de recuperación de errores queda también dentro de 'sintactico'
+        self.parser.errorfunc = estadisticas.cronometrar('recuperacion_errores',
+                                                         self.parser.errorfunc)
+        with estadisticas.fase('sintactico'):
+            self.arbol = self.parser.parse(lexer=FuenteTokens(tokens_lexer))
+        with self._fase('semantico'):
+            self._analizar_semantica()
+        with self._fase('optimizacion'):
+            self._optimizar()
+        return self.arbol
+
+    def _analizar_semantica(self):
+        # Antes de optimizar: los pases cambian el árbol (y agregan temporales)
+        self._simbolos = analizar_semantica(self.arbol, self.errores_semanticos)
+
+    @property
+    def simbolos(self):
+        # TablaSimbolos del último análisis. Si el resultado vino de la
+        # caché se reconstruye al pedirla (sus diagnósticos ya se tienen).
+        if self._simbolos is None:
+            self._simbolos = analizar_semantica(self.arbol, [])
+        return self._simbolos
+
+    def _optimizar(self):
+        if self.optimizaciones:
+            from optimizador import optimizar
+            self.optimizacion = optimizar(self.arbol, self.optimizaciones)
+
+    def _fuente_tokens(self, bloques):
+        if self.progreso is not None:
+            self.progreso.iniciar_fase('analisis')
+            bloques = self._seguir_bloques(bloques)
+        if self.procesos_lexico and self.procesos_lexico > 1:
+            fuente = self._tokens_en_paralelo(bloques)
+        else:
+            fuente = self.tokens.registrar(self._lexear_bloques(bloques))
+        if self.progreso is not None:
+            fuente = self._contar_tokens(fuente)
+        return fuente
+
+    def _seguir_bloques(self, bloques):
+        # Cada bloque cuenta como lexeado cuando se pide el siguiente
+        progreso = self.progreso
+        for bloque in bloques:
+            progreso.comprobar()
+            yield bloque
+            progreso.bytes_lexeados += len(bloque.encode('utf-8'))
+
+    def _contar_tokens(self, fuente):
+        progreso = self.progreso
+        cada = progreso.CADA_TOKENS
+        contador = 0
+        for tok in fuente:
+            yield tok
+            contador += 1
+            if contador == cada:
+                progreso.tokens += contador
+                contador = 0
+                progreso.comprobar()
+        progreso.tokens += contador
+
+    def _lexear_bloques(self, bloques):
+        # El lexer conserva lineno entre bloques
+        for bloque in bloques:
+            self.lexer.input(bloque)
+            yield from self.lexer
+
+    def _tokens_en_paralelo(self, bloques):
+        bloques = iter(bloques)
+        primeros = list(itertools.islice(bloques, 2))
+        if len(primeros) < 2:
+            # Un solo bloque: no compensa repartirlo
+            yield from self.tokens.registrar(self._lexear_bloques(primeros))
+            return
 
-        # Generar archivos de salida
-        generar_archivo_tok(tokens_para_archivos, output_dir)
-        generar_archivo_tab(tokens_para_archivos, output_dir)
-        generar_depuracion(tokens_para_archivos, output_dir)
-        generar_arbol_sintactico(arbol, output_dir)
+        if self._ejecutor_lexico is None:
+            from concurrent.futures import ProcessPoolExecutor
+            self._ejecutor_lexico = ProcessPoolExecutor(max_workers=self.procesos_lexico)
+        for tabla, errores, fallo in lexear_en_paralelo(itertools.chain(primeros, bloques),
+                                                        self._ejecutor_lexico, self.motor_lexico,
+                                                        2 * self.procesos_lexico):
+            self.errores_lexicos.extend(errores)
+            self.tokens.extender(tabla)
+            yield from tabla.tokens()
+            if fallo:
+                raise lex.LexError(*fallo)
+
+    def resultado(self, incluir_tokens=True):
+        # Resultado estructurado (serializable a JSON) del último análisis;
+        # el árbol se serializa aparte con arbol_a_json
+        resultado = {
+            'errores_lexicos': self.errores_lexicos,
+            'errores_sintacticos': self.errores_sintacticos,
+            'errores_semanticos': self.errores_semanticos,
+        }
+        if incluir_tokens:
+            resultado['tokens'] = self.tokens.como_diccionarios()
+        if self.optimizacion is not None:
+            resultado['optimizacion'] = self.optimizacion
+        if self.estadisticas is not None:
+            resultado['estadisticas'] = self.estadisticas.como_diccionario()
+        return resultado
+
+    def generar_archivos(self, salida=None):
+        salida = self.salida if salida is None else salida
+        with self._fase('generar_archivos_tokens'):
+            generar_archivos_tokens(self.tokens, salida, self.errores_lexicos)
+        with self._fase('generar_arbol_sintactico'):
+            generar_arbol_sintactico(self.arbol, salida)
+        if self.arbol_binario:
+            with self._fase('generar_arbol_binario'):
+                generar_arbol_binario(self.arbol, salida)
+
+    # ---- Instrumentación ----
+
+    def _nuevas_estadisticas(self):
+        if self.instrumentacion is None:
+            self.estadisticas = None
+        else:
+            self.estadisticas = EstadisticasCompilacion(self.instrumentacion.ganchos)
+
+    def _fase(self, nombre):
+        if self.progreso is not None:
+            self.progreso.iniciar_fase(nombre)
+        if self.estadisticas is None:
+            return contextlib.nullcontext()
+        return self.estadisticas.fase(nombre)
+
+    def _cerrar_estadisticas(self, archivo, ok, mensaje):
+        estadisticas = self.estadisticas
+        estadisticas.datos.update({
+            'archivo': archivo,
+            'ok': ok,
+            'mensaje': mensaje,
+            'desde_cache': self.desde_cache,
+            'tokens': len(self.tokens),
+            'nodos': contar_nodos(self.arbol),
+            'errores_lexicos': len(self.errores_lexicos),
+            'errores_sintacticos': len(self.errores_sintacticos),
+            'errores_semanticos': len(self.errores_semanticos),
+            'optimizacion': self.optimizacion,
+            'memoria_maxima_proceso': _memoria_maxima_proceso(),
+        })
+        reporte = estadisticas.como_diccionario()
+        estadisticas._avisar('compilacion', reporte)
+        if self.instrumentacion.reporte_json:
+            with _abrir_salida(self.salida, ARCHIVO_ESTADISTICAS) as f:
+                json.dump(reporte, f, ensure_ascii=False, indent=2)
+
+    def _generar_con_cache(self, clave):
+        # Los archivos se generan en memoria para guardarlos en la caché y
+        # después se copian al destino
+        memoria = SalidaMemoria()
+        self.generar_archivos(memoria)
+        archivos = dict(memoria.archivos)
+        arbol = archivos.pop('progfte.arbb', None) or serializar_arbol(self.arbol)
+        self.cache.guardar(clave, {
+            'archivos': archivos,
+            'arbol': arbol,
+            'tokens': self.tokens,
+            'errores_lexicos': self.errores_lexicos,
+            'errores_sintacticos': self.errores_sintacticos,
+            'errores_semanticos': self.errores_semanticos,
+            'optimizacion': self.optimizacion,
+        })
+        self._volcar(memoria.archivos)
+
+    def _restaurar(self, entrada):
+        self._reiniciar()
+        self.tokens = entrada['tokens']
+        self.errores_lexicos.extend(entrada['errores_lexicos'])
+        self.errores_sintacticos.extend(entrada['errores_sintacticos'])
+        self.errores_semanticos.extend(entrada['errores_semanticos'])
+        self.optimizacion = entrada.get('optimizacion')
+        self.arbol = deserializar_arbol(entrada['arbol'])
+        archivos = dict(entrada['archivos'])
+        if self.arbol_binario:
+            archivos['progfte.arbb'] = entrada['arbol']
+        self._volcar(archivos)
+
+    def _volcar(self, archivos):
+        for nombre, contenido in archivos.items():
+            with _abrir_salida(self.salida, nombre, binario=isinstance(contenido, bytes)) as f:
+                f.write(contenido)
+
+    def analizar_archivo(self, file_path):
+        self._nuevas_estadisticas()
+        ok, mensaje = self._analizar_archivo(file_path)
+        if self.estadisticas is not None:
+            self._cerrar_estadisticas(file_path, ok, mensaje)
+        return ok, mensaje
+
+    def _analizar_archivo(self, file_path):
+        try:
+            if self.progreso is not None:
+                self.progreso.reiniciar(os.path.getsize(file_path))
+            if self.cache is None:
+                self._analizar(bloques_archivo(file_path))
+                self.generar_archivos()
+            else:
+                with proyectar_archivo(file_path) as datos:
+                    with self._fase('cache'):
+                        clave = self.cache.clave(datos, ','.join(self.optimizaciones))
+                        entrada = self.cache.obtener(clave)
+                    if (entrada is not None and self.limite_errores is not None
+                            and len(entrada['errores_sintacticos']) >= self.limite_errores):
+                        # Se repite el análisis, que se detiene en el límite
+                        # con los mismos errores (léxicos incluidos) que sin
+                        # caché y sin escribir nada
+                        entrada = None
+                    self.desde_cache = entrada is not None
+                    if not self.desde_cache:
+                        self._analizar(bloques_mapeados(datos))
+                if self.desde_cache:
+                    with self._fase('cache'):
+                        self._restaurar(entrada)
+                else:
+                    self._generar_con_cache(clave)
+
+            return True, (f"Análisis completado ({len(self.errores_lexicos)} errores léxicos, "
+                          f"{len(self.errores_sintacticos)} sintácticos, "
+                          f"{len(self.errores_semanticos)} semánticos). "
+                          f"Archivos guardados en: {self.salida}")
+
+        except (CompilacionCancelada, LimiteErroresAlcanzado) as e:
+            return False, str(e)
+        except Exception as e:
+            return False, f"Error: {str(e)}"
+
+def analizar_archivo(file_path, output_dir=None, progreso=None):
+    return SesionCompilador(output_dir=output_dir, progreso=progreso).analizar_archivo(file_path)
 
-        return True, f"Análisis completado. Archivos guardados en: {output_dir}"
+# ----------------------------
+# Análisis incremental
+# ----------------------------
 
-    except Exception as e:
-        return False, f"Error: {str(e)}"
+# Parsers de una sola declaración / instrucción (se construyen al usarse)
+_parsers_unidad = {}
+
+def _parser_unidad(inicio):
+    if inicio not in _parsers_unidad:
+        _parsers_unidad[inicio] = construir_parser(inicio=inicio)
+    return _parsers_unidad[inicio]
+
+class _UnidadInvalida(Exception):
+    pass
+
+def _rechazar_unidad(p):
+    # Una unidad con errores no se recupera: se analiza el programa completo
+    raise _UnidadInvalida()
+
+def _crear_token(tipo, valor, linea):
+    return TokenLexico(tipo, valor, linea, 0)
+
+class AnalizadorIncremental:
+    # Conserva los tokens por renglón del último análisis. Ningún token
+    # cruza un salto de línea (los comentarios terminan en él), así que al
+    # editar solo se vuelven a lexear los renglones modificados.
+    #
+    # Si el programa anterior no tenía errores sintácticos, solo se vuelven
+    # a analizar las declaraciones o instrucciones afectadas: desde el ';'
+    # anterior a la edición hasta el primer ';' posterior. Si la edición
+    # toca el encabezado, Inicio o Fin, o alguna unidad no es válida por sí
+    # sola, se analiza de nuevo la secuencia completa de tokens (sin volver
+    # a lexear). El resultado es siempre igual al de un análisis completo.
+    #
+    # Si una edición local agrega o quita renglones, los nodos posteriores
+    # conservan sus renglones viejos hasta que se piden `arbol`, los
+    # resultados semánticos o los archivos (así la latencia depende solo
+    # del tamaño de la edición).
+    def __init__(self, output_dir=None, salida=None, motor_lexico='rapido'):
+        if salida is None:
+            salida = SalidaDirectorio(output_dir) if output_dir else SalidaMemoria()
+        self.sesion = SesionCompilador(salida=salida, motor_lexico=motor_lexico)
+        self._lexer = self.sesion.lexer.clone()
+        self._parsers = {}
+        self.estadisticas = {'renglones_lexeados': 0, 'unidades_analizadas': 0,
+                             'analisis_completos': 0}
+        self.texto = None
+        self._lineas_al_dia = True
+
+    def _parser(self, inicio):
+        if inicio not in self._parsers:
+            self._parsers[inicio] = copy.copy(_parser_unidad(inicio))
+            self._parsers[inicio].errorfunc = _rechazar_unidad
+        return self._parsers[inicio]
+
+    # ---- Estado por renglón ----
+
+    def analizar(self, contenido):
+        # Análisis completo; deja preparado el estado por renglón
+        self.sesion.analizar(contenido)
+        self.texto = contenido
+        renglones = contenido.count('\n') + 1
+        self.tokens_linea = [[] for _ in range(renglones)]
+        self.errores_linea = [[] for _ in range(renglones)]
+        for tipo, valor, linea in self.sesion.tokens:
+            self.tokens_linea[linea - 1].append((tipo, valor))
+        for error in self.sesion.errores_lexicos:
+            self.errores_linea[error['line'] - 1].append(error)
+        self.puntos_linea = [_contar_puntos(t) for t in self.tokens_linea]
+        self._semantica_al_dia = True
+        self.estadisticas['renglones_lexeados'] += renglones
+        self.estadisticas['analisis_completos'] += 1
+        self._analizar_estructura()
+        return self.arbol
+
+    def _lexear_linea(self, texto, linea):
+        self._lexer.errores_lexicos = errores = []
+        self._lexer.lineno = linea
+        self._lexer.input(texto)
+        tokens_linea = [(tok.type, tok.value) for tok in self._lexer]
+        return tokens_linea, errores
+
+    def actualizar(self, contenido):
+        # Localiza la zona del texto que cambió (comparando bloques en C) y
+        # la traduce a renglones
+        if self.texto is None:
+            return self.analizar(contenido)
+        viejo = self.texto
+        if contenido == viejo:
+            return self.arbol
+        p = _prefijo_comun(viejo, contenido)
+        q = _sufijo_comun(viejo, contenido, min(len(viejo), len(contenido)) - p)
+
+        fin_viejo, fin_nuevo = len(viejo) - q, len(contenido) - q
+        inicio = viejo.count('\n', 0, p)
+        fin = viejo.count('\n', 0, fin_viejo) + 1
+        desde = contenido.rfind('\n', 0, p) + 1
+        hasta = contenido.find('\n', fin_nuevo)
+        if hasta < 0:
+            hasta = len(contenido)
+        if fin_viejo and fin_nuevo and viejo[fin_viejo-1] == '\n' and contenido[fin_nuevo-1] == '\n':
+            # El cambio termina en un salto de línea: el renglón siguiente no cambia
+            fin -= 1
+            hasta = fin_nuevo - 1
+        lineas_nuevas = _partir_lineas(contenido[desde:hasta]) if hasta >= desde else []
+        arbol = self._reemplazar(inicio, fin, lineas_nuevas)
+        self.texto = contenido
+        return arbol
+
+    def _reemplazar(self, inicio, fin, lineas_nuevas):
+        lexeados = [self._lexear_linea(texto, inicio + k + 1)
+                    for k, texto in enumerate(lineas_nuevas)]
+        self.estadisticas['renglones_lexeados'] += len(lexeados)
+        tokens_nuevos = [t for t, _ in lexeados]
+
+        puede_ser_local = self._estructura is not None and self._edicion_local(
+            inicio, fin, tokens_nuevos)
+        unidades_viejas = self._unidades_afectadas(inicio, fin) if puede_ser_local else None
+
+        self.tokens_linea[inicio:fin] = tokens_nuevos
+        self.errores_linea[inicio:fin] = [e for _, e in lexeados]
+        self.puntos_linea[inicio:fin] = [_contar_puntos(t) for t in tokens_nuevos]
+        self._materializado = False
+
+        if unidades_viejas is not None:
+            desplazamiento = len(lineas_nuevas) - (fin - inicio)
+            if self._reanalizar_local(unidades_viejas, inicio + len(lineas_nuevas), desplazamiento):
+                return self.arbol
+        self._reanalizar_completo()
+        return self.arbol
+
+    # ---- Estructura del programa ----
+
+    def _analizar_estructura(self):
+        # Solo se guarda la estructura de programas sin errores:
+        # encabezado (2 tokens), declaraciones, Inicio, instrucciones, Fin
+        self._estructura = None
+        self._materializado = True
+        self._lineas_al_dia = True
+        if self.sesion.errores_sintacticos or self.sesion.arbol is None:
+            return
+        posiciones = {}
+        contador = 0
+        for n, tokens_linea in enumerate(self.tokens_linea):
+            for tipo, _ in tokens_linea:
+                contador += 1
+                if contador == 2:
+                    posiciones['encabezado'] = n
+                if tipo in ('PALABRA_RESERVADA_INICIO', 'PALABRA_RESERVADA_FIN'):
+                    posiciones[tipo] = n
+        self._estructura = {
+            'encabezado': posiciones['encabezado'],
+            'inicio': posiciones['PALABRA_RESERVADA_INICIO'],
+            'fin': posiciones['PALABRA_RESERVADA_FIN'],
+        }
+        # Renglón donde empezaba cada unidad cuando se crearon sus nodos
+        self._renglones = {seccion: self._renglones_unidades(seccion)
+                           for seccion in ('declaracion', 'instruccion')}
+
+    def _edicion_local(self, inicio, fin, tokens_nuevos):
+        e = self._estructura
+        seccion_decl = e['encabezado'] < inicio and fin <= e['inicio']
+        seccion_instr = e['inicio'] < inicio and fin <= e['fin']
+        if not (seccion_decl or seccion_instr):
+            return False
+        return not any(tipo in ('PALABRA_RESERVADA_INICIO', 'PALABRA_RESERVADA_FIN')
+                       for tokens_linea in tokens_nuevos for tipo, _ in tokens_linea)
+
+    def _unidades_afectadas(self, inicio, fin):
+        # Posición (renglón, índice) donde empieza la zona afectada: justo
+        # después del último ';' (o del encabezado / Inicio) anterior
+        e = self._estructura
+        seccion = 'declaracion' if fin <= e['inicio'] else 'instruccion'
+        limite = e['encabezado'] if seccion == 'declaracion' else e['inicio']
+        n = inicio - 1
+        while True:
+            tokens_linea = self.tokens_linea[n]
+            indice_limite = self._indice_limite(seccion) if n == limite else None
+            corte = None
+            for k in range(len(tokens_linea) - 1, -1, -1):
+                if tokens_linea[k][0] == 'PUNTOYCOMA' or k == indice_limite:
+                    corte = k + 1
+                    break
+            if corte is not None:
+                break
+            n -= 1
+
+        puntos_antes = sum(self.puntos_linea[:n]) + _contar_puntos(self.tokens_linea[n][:corte])
+        if seccion == 'instruccion':
+            puntos_antes -= len(self._lista('declaracion').hijos)
+
+        # Unidades viejas: los ';' de los renglones editados; el ';' que
+        # cierra la zona en los renglones siguientes se suma al recorrerlos
+        puntos_zona = sum(self.puntos_linea[inicio:fin])
+        return {'seccion': seccion, 'renglon': n, 'corte': corte, 'indice': puntos_antes,
+                'viejas': puntos_zona, 'fin_edicion': fin}
+
+    def _indice_limite(self, seccion):
+        # Índice, dentro de su renglón, del último token del encabezado o
+        # del token Inicio
+        e = self._estructura
+        if seccion == 'declaracion':
+            anteriores = sum(len(self.tokens_linea[n]) for n in range(e['encabezado']))
+            return 1 - anteriores
+        return [t for t, _ in self.tokens_linea[e['inicio']]].index('PALABRA_RESERVADA_INICIO')
+
+    def _renglones_unidades(self, seccion):
+        # Renglón (desde 1) del primer token de cada declaración o
+        # instrucción según los tokens actuales; recorre renglones, no tokens
+        e = self._estructura
+        n = e['encabezado'] if seccion == 'declaracion' else e['inicio']
+        total = len(self._lista(seccion).hijos)
+        tokens = self.tokens_linea[n][self._indice_limite(seccion) + 1:]
+        puntos = _contar_puntos(tokens)
+        renglones = array('i')
+        abierta = True  # El siguiente token empieza una unidad
+        while True:
+            if tokens:
+                if abierta:
+                    renglones.append(n + 1)
+                # Cada ';' seguido de otro token en el renglón abre otra unidad
+                abierta = tokens[-1][0] == 'PUNTOYCOMA'
+                renglones.extend(array('i', (n + 1,)) * (puntos - abierta))
+                if len(renglones) >= total:
+                    break
+            n += 1
+            tokens, puntos = self.tokens_linea[n], self.puntos_linea[n]
+        del renglones[total:]
+        return renglones
+
+    def _resolver_lineas(self):
+        # Corrige los renglones de las unidades que se movieron desde que
+        # se crearon sus nodos
+        if self._lineas_al_dia:
+            return
+        for seccion, registrados in self._renglones.items():
+            actuales = self._renglones_unidades(seccion)
+            hijos = self._lista(seccion).hijos
+            for k, (antes, ahora) in enumerate(zip(registrados, actuales)):
+                if antes != ahora:
+                    _desplazar_lineas((hijos[k],), ahora - antes)
+            self._renglones[seccion] = actuales
+        self._lineas_al_dia = True
+
+    def _lista(self, seccion):
+        programa = self.sesion.arbol
+        if seccion == 'declaracion':
+            return programa.hijos[1]
+        return programa.hijos[2].hijos[0]
+
+    def _reanalizar_local(self, zona, fin_edicion, desplazamiento):
+        e = self._estructura
+        limite = e['inicio'] if zona['seccion'] == 'declaracion' else e['fin']
+        limite += desplazamiento
+
+        # Tokens desde el inicio de la zona hasta el primer ';' tras la edición
+        tokens_zona = [(tipo, valor, zona['renglon'] + 1)
+                       for tipo, valor in self.tokens_linea[zona['renglon']][zona['corte']:]]
+        n = zona['renglon'] + 1
+        viejas = zona['viejas']
+        while n < fin_edicion or not tokens_zona or tokens_zona[-1][0] != 'PUNTOYCOMA':
+            if n >= limite:
+                return False  # Se llegó a Inicio/Fin sin cerrar la unidad
+            for tipo, valor in self.tokens_linea[n]:
+                tokens_zona.append((tipo, valor, n + 1))
+                if n >= fin_edicion and tipo == 'PUNTOYCOMA':
+                    viejas += 1
+                    break
+            n += 1
+
+        unidades = []
+        actual = []
+        for tipo, valor, linea in tokens_zona:
+            actual.append(_crear_token(tipo, valor, linea))
+            if tipo == 'PUNTOYCOMA':
+                unidades.append(actual)
+                actual = []
+        if actual:
+            return False
+
+        parser_unidad = self._parser(zona['seccion'])
+        nodos = []
+        try:
+            for unidad in unidades:
+                nodos.append(parser_unidad.parse(lexer=FuenteTokens(unidad)))
+        except _UnidadInvalida:
+            return False
+        self.estadisticas['unidades_analizadas'] += len(nodos)
+
+        lista = self._lista(zona['seccion'])
+        if len(lista.hijos) - viejas + len(nodos) == 0:
+            return False
+        lista.hijos[zona['indice']:zona['indice'] + viejas] = nodos
+        self._renglones[zona['seccion']][zona['indice']:zona['indice'] + viejas] = array(
+            'i', (unidad[0].lineno for unidad in unidades))
+        if desplazamiento:
+            # Las unidades posteriores conservan los renglones de antes
+            # hasta _resolver_lineas
+            self._lineas_al_dia = False
+        self._semantica_al_dia = False
+
+        for clave in ('inicio', 'fin'):
+            if e[clave] >= zona['fin_edicion']:
+                e[clave] += desplazamiento
+        return True
+
+    def _reanalizar_completo(self):
+        # Se reutilizan los tokens por renglón; solo se repite el parser
+        tokens_lexer = [_crear_token(tipo, valor, n + 1)
+                        for n, tokens_linea in enumerate(self.tokens_linea)
+                        for tipo, valor in tokens_linea]
+        sesion = self.sesion
+        sesion._reiniciar()
+        sesion.arbol = sesion.parser.parse(lexer=FuenteTokens(tokens_lexer))
+        self._semantica_al_dia = False
+        self.estadisticas['analisis_completos'] += 1
+        self._analizar_estructura()
+        self._materializado = False
+
+    # ---- Resultados ----
+
+    def _materializar(self):
+        # Construye las listas planas de tokens y errores de la sesión
+        if self._materializado:
+            return
+        sesion = self.sesion
+        sesion.tokens = TablaTokens()
+        for n, tokens_linea in enumerate(self.tokens_linea):
+            for tipo, valor in tokens_linea:
+                sesion.tokens.agregar(tipo, valor, n + 1)
+        sesion.errores_lexicos[:] = [dict(error, line=n + 1)
+                                     for n, errores in enumerate(self.errores_linea)
+                                     for error in errores]
+        self._materializado = True
+
+    @property
+    def arbol(self):
+        self._resolver_lineas()
+        return self.sesion.arbol
+
+    @property
+    def tokens(self):
+        self._materializar()
+        return self.sesion.tokens
+
+    @property
+    def errores_lexicos(self):
+        self._materializar()
+        return self.sesion.errores_lexicos
+
+    @property
+    def errores_sintacticos(self):
+        return self.sesion.errores_sintacticos
+
+    def _actualizar_semantica(self):
+        # El análisis semántico se repite (completo) solo al pedir sus resultados
+        if not self._semantica_al_dia:
+            self._resolver_lineas()
+            self.sesion.errores_semanticos.clear()
+            self.sesion._analizar_semantica()
+            self._semantica_al_dia = True
+
+    @property
+    def errores_semanticos(self):
+        self._actualizar_semantica()
+        return self.sesion.errores_semanticos
+
+    @property
+    def simbolos(self):
+        self._actualizar_semantica()
+        return self.sesion.simbolos
+
+    def generar_archivos(self, salida=None):
+        self._materializar()
+        self._resolver_lineas()
+        self.sesion.generar_archivos(salida)
+
+    def analizar_archivo(self, file_path):
+        # Igual que SesionCompilador.analizar_archivo, pero reutilizando el
+        # análisis anterior del mismo archivo
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                contenido = f.read()
+            self.actualizar(contenido)
+            self.generar_archivos()
+            return True, (f"Análisis completado ({len(self.errores_lexicos)} errores léxicos, "
+                          f"{len(self.errores_sintacticos)} sintácticos, "
+                          f"{len(self.errores_semanticos)} semánticos). "
+                          f"Archivos guardados en: {self.sesion.salida}")
+        except CompilacionCancelada as e:
+            return False, str(e)
+        except Exception as e:
+            return False, f"Error: {str(e)}"
+
+def _partir_lineas(contenido):
+    # Solo '\n' separa renglones para el lexer (no '\r', '\x0b', ...). El
+    # salto final no produce tokens, así que los renglones se guardan sin él.
+    return contenido.split('\n')
+
+def _desplazar_lineas(nodos, desplazamiento):
+    pendientes = list(nodos)
+    while pendientes:
+        nodo = pendientes.pop()
+        if nodo.linea is not None:
+            nodo.linea += desplazamiento
+        pendientes.extend(nodo.hijos)
+
+def _contar_puntos(tokens_linea):
+    return sum(1 for tipo, _ in tokens_linea if tipo == 'PUNTOYCOMA')
+
+def _prefijo_comun(a, b, bloque=1 << 16):
+    # Se comparan bloques completos y, en el primero distinto, se busca
+    # la posición exacta por bisección
+    n = min(len(a), len(b))
+    i = 0
+    while i < n and a[i:i+bloque] == b[i:i+bloque]:
+        i += bloque
+    bajo, alto = i, min(i + bloque, n)
+    while bajo < alto:
+        medio = (bajo + alto + 1) // 2
+        if a[i:medio] == b[i:medio]:
+            bajo = medio
+        else:
+            alto = medio - 1
+    return min(bajo, n)
+
+def _sufijo_comun(a, b, maximo, bloque=1 << 16):
+    # Igual que _prefijo_comun pero desde el final, sin pasar de `maximo`
+    la, lb = len(a), len(b)
+    k = 0
+    while k + bloque <= maximo and a[la-k-bloque:la-k] == b[lb-k-bloque:lb-k]:
+        k += bloque
+    bajo, alto = k, min(k + bloque, maximo)
+    while bajo < alto:
+        medio = (bajo + alto + 1) // 2
+        if a[la-medio:la-k] == b[lb-medio:lb-k]:
+            bajo = medio
+        else:
+            alto = medio - 1
+    return bajo
 
 # ----------------------------
 # Interfaz Gráfica
 # ----------------------------
 
 def main():
+    # La interfaz solo se importa cuando realmente se abre la ventana
+    import queue
+    import tkinter as tk
+    from tkinter import filedialog, ttk
+
     root = tk.Tk()
     root.title("Analizador Léxico y Sintáctico")
-    root.geometry("650x350")
+    root.geometry("650x420")
     root.configure(bg="#f0f0f0")
 
     main_frame = tk.Frame(root, bg="#f0f0f0")
@@ -458,6 +2315,7 @@ def main():
     left_panel.pack(side=tk.LEFT, fill=tk.Y)
 
     try:
+        from PIL import Image, ImageTk
         img = Image.new('RGB', (150, 150), color='white')
         img_tk = ImageTk.PhotoImage(img)
         img_label = tk.Label(left_panel, image=img_tk, bg="#f0f0f0")
@@ -469,35 +2327,127 @@ def main():
     right_panel = tk.Frame(content_frame, bg="#f0f0f0")
     right_panel.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
 
-    tk.Label(right_panel, text="Seleccione archivo fuente (.txt):", 
+    tk.Label(right_panel, text="Seleccione archivos fuente (.txt):", 
             font=("Arial", 12), bg="#f0f0f0").pack(anchor=tk.W)
 
     btn_frame = tk.Frame(right_panel, bg="#f0f0f0")
     btn_frame.pack(fill=tk.X, pady=10)
 
-    btn = tk.Button(btn_frame, text="Analizar Archivo", 
-                   command=lambda: procesar_archivo(),
+    btn = tk.Button(btn_frame, text="Analizar Archivos", 
+                   command=lambda: seleccionar_archivos(),
                    font=("Arial", 12, "bold"), 
                    bg="#4CAF50", fg="white",
                    padx=20, pady=8)
-    btn.pack()
+    btn.pack(side=tk.LEFT)
 
-    status_label = tk.Label(right_panel, text="", font=("Arial", 11), 
-                          bg="#f0f0f0", fg="green", wraplength=400)
-    status_label.pack(anchor=tk.W, pady=(20, 0))
+    btn_cancelar = tk.Button(btn_frame, text="Cancelar",
+                            command=lambda: cancelar(),
+                            font=("Arial", 12), state=tk.DISABLED,
+                            padx=12, pady=8)
+    btn_cancelar.pack(side=tk.LEFT, padx=(10, 0))
 
-    def procesar_archivo():
-        file_path = filedialog.askopenfilename(filetypes=[("Archivos texto", "*.txt")])
-        if not file_path:
-            return
+    barra = ttk.Progressbar(right_panel, mode='determinate', maximum=100)
+    barra.pack(fill=tk.X, pady=(10, 0))
 
-        success, message = analizar_archivo(file_path)
-        
-        if success:
-            status_label.config(text=f"✓ {message}", fg="green")
-        else:
-            status_label.config(text=f"✗ {message}", fg="red")
+    progress_label = tk.Label(right_panel, text="", font=("Arial", 10), 
+                             bg="#f0f0f0", fg="#555", wraplength=400, justify=tk.LEFT)
+    progress_label.pack(anchor=tk.W, pady=(5, 0))
 
+    status_label = tk.Label(right_panel, text="", font=("Arial", 11), 
+                          bg="#f0f0f0", fg="green", wraplength=400, justify=tk.LEFT)
+    status_label.pack(anchor=tk.W, pady=(15, 0))
+
+    # El análisis corre en un hilo de fondo, un archivo a la vez; la
+    # interfaz solo se toca desde el hilo de Tk, que cada INTERVALO_MS
+    # consulta el progreso y recoge los resultados de la cola
+    INTERVALO_MS = 100
+    pendientes = collections.deque()
+    resultados = queue.Queue()
+    actual = {'archivo': None, 'progreso': None}
+    # Al volver a analizar un archivo ya abierto solo se repite lo que
+    # cambió en él. Los archivos grandes siguen el camino por bloques, sin
+    # guardar su texto ni sus tokens por renglón.
+    LIMITE_INCREMENTAL = 16 * 2**20
+    analizadores = {}
+
+    def trabajar(file_path, progreso):
+        try:
+            with sin_recolector():
+                if os.path.getsize(file_path) > LIMITE_INCREMENTAL:
+                    analizadores.pop(file_path, None)
+                    resultado = analizar_archivo(file_path, progreso=progreso)
+                else:
+                    analizador = analizadores.get(file_path)
+                    if analizador is None:
+                        analizador = AnalizadorIncremental(output_dir=RUTA_SALIDA_ALTERNATIVA)
+                    analizador.sesion.progreso = progreso
+                    resultado = analizador.analizar_archivo(file_path)
+                    # Tras un error o una cancelación su estado ya no sirve de base
+                    if resultado[0]:
+                        analizadores[file_path] = analizador
+                    else:
+                        analizadores.pop(file_path, None)
+        except Exception as e:
+            resultado = (False, f"Error: {str(e)}")
+        resultados.put((file_path, *resultado))
+
+    def seleccionar_archivos():
+        rutas = filedialog.askopenfilenames(filetypes=[("Archivos texto", "*.txt")])
+        pendientes.extend(rutas)
+        siguiente()
+
+    def siguiente():
+        if actual['archivo'] is not None or not pendientes:
+            return
+        file_path = pendientes.popleft()
+        progreso = ProgresoCompilacion()
+        actual.update(archivo=file_path, progreso=progreso)
+        threading.Thread(target=trabajar, args=(file_path, progreso), daemon=True).start()
+        btn_cancelar.config(state=tk.NORMAL)
+
+    def cancelar():
+        # Cancela el archivo en curso y los que esperan en la cola
+        pendientes.clear()
+        if actual['progreso'] is not None:
+            actual['progreso'].cancelar()
+
+    def mostrar_progreso():
+        progreso = actual['progreso']
+        if progreso is None:
+            barra['value'] = 0
+            progress_label.config(text="")
+            btn_cancelar.config(state=tk.DISABLED)
+            return
+        fraccion = progreso.fraccion()
+        barra['value'] = 100 * (fraccion or 0)
+        cola = f" — {len(pendientes)} en cola" if pendientes else ""
+        progress_label.config(
+            text=f"{os.path.basename(actual['archivo'])}: {progreso.bytes_lexeados / 2**20:.1f} "
+                 f"de {progreso.bytes_total / 2**20:.1f} MB, {progreso.tokens} tokens "
+                 f"({progreso.fase or 'inicio'}){cola}")
+
+    def sondear():
+        while True:
+            try:
+                file_path, success, message = resultados.get_nowait()
+            except queue.Empty:
+                break
+            actual.update(archivo=None, progreso=None)
+            nombre = os.path.basename(file_path)
+            if success:
+                status_label.config(text=f"✓ {nombre}: {message}", fg="green")
+            else:
+                status_label.config(text=f"✗ {nombre}: {message}", fg="red")
+        siguiente()
+        mostrar_progreso()
+        root.after(INTERVALO_MS, sondear)
+
+    def cerrar():
+        cancelar()
+        root.destroy()
+
+    root.protocol("WM_DELETE_WINDOW", cerrar)
+    root.after(INTERVALO_MS, sondear)
     root.mainloop()
 
 if __name__ == "__main__":
@@ -0,0 +1,104 @@
+import os
+import sys
+import time
+import tracemalloc
+import types
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from ply import yacc
+
+import Compilador
+
+# ----------------------------
+# Memoria y tiempo de construcción del árbol sintáctico: representación
+# actual (Nodo con __slots__ y listas planas) frente a la anterior (Nodo
+# con __dict__ y un nodo DECLARACIONES/INSTRUCCIONES por sentencia).
+#
+#   python benchmarks/bench_arbol.py [max_instrucciones]
+# ----------------------------
+
+class NodoClasico:
+    def __init__(self, tipo, hijos=None, valor=None, linea=None):
+        # `linea` se acepta porque las reglas lo pasan, pero la
+        # representación anterior no guardaba renglones
+        self.tipo = tipo
+        self.hijos = hijos if hijos is not None else []
+        self.valor = valor
+
+def p_declaraciones_clasico(p):
+    '''declaraciones : declaracion
+                    | declaraciones declaracion'''
+    if len(p) == 2:
+        p[0] = Nodo('DECLARACIONES', [p[1]])
+    else:
+        p[0] = Nodo('DECLARACIONES', [p[1], p[2]])
+
+def p_instrucciones_clasico(p):
+    '''instrucciones : instruccion
+                    | instrucciones instruccion'''
+    if len(p) == 2:
+        p[0] = Nodo('INSTRUCCIONES', [p[1]])
+    else:
+        p[0] = Nodo('INSTRUCCIONES', [p[1], p[2]])
+
+def parser_clasico():
+    # Mismas reglas del compilador, pero construyendo el árbol anterior
+    globales = dict(vars(Compilador), Nodo=NodoClasico)
+    reglas = {}
+    for nombre, f in vars(Compilador).items():
+        if nombre.startswith('p_') and isinstance(f, types.FunctionType):
+            codigo = {'p_declaraciones': p_declaraciones_clasico,
+                      'p_instrucciones': p_instrucciones_clasico}.get(nombre, f).__code__
+            reglas[nombre] = types.FunctionType(codigo, globales, nombre)
+            reglas[nombre].__doc__ = f.__doc__
+    modulo = types.SimpleNamespace(tokens=Compilador.tokens, precedence=Compilador.precedence,
+                                   __file__=Compilador.__file__, **reglas)
+    return yacc.yacc(module=modulo, start='programa', debug=False, write_tables=False, errorlog=yacc.NullLogger())
+
+def programa(instrucciones):
+    variables = max(1, instrucciones // 10)
+    lineas = ['pf2024 Ejem1']
+    lineas += [f'int v{i};' for i in range(variables)]
+    lineas.append('Inicio')
+    for i in range(instrucciones):
+        a, b, c = i % variables, (i * 7) % variables, (i * 13) % variables
+        lineas.append((f'v{a}:=v{b}*(v{c}+{i})-3;', f'leerdig(v{a});', f'impcad(v{b});')[i % 3])
+    lineas.append('Fin')
+    return '\n'.join(lineas) + '\n'
+
+def medir(parser, tokens):
+    # El tiempo se mide sin tracemalloc (que encarece cada asignación)
+    inicio = time.perf_counter()
+    parser.parse(lexer=Compilador.FuenteTokens(tokens))
+    segundos = time.perf_counter() - inicio
+
+    tracemalloc.start()
+    arbol = parser.parse(lexer=Compilador.FuenteTokens(tokens))
+    memoria = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del arbol
+    return segundos, memoria
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    maximo = int(argv[0]) if argv else 200_000
+    clasico = parser_clasico()
+    actual = Compilador.SesionCompilador(salida=Compilador.SalidaMemoria()).parser
+
+    print(f"{'instrucciones':>13} {'anterior (s)':>13} {'actual (s)':>11} "
+          f"{'anterior (MB)':>14} {'actual (MB)':>12} {'ahorro':>7}")
+    for instrucciones in (n for n in (1_000, 10_000, 50_000, 200_000, 1_000_000) if n <= maximo):
+        lexer = Compilador.lexer.clone()
+        lexer.errores_lexicos = []
+        lexer.input(programa(instrucciones))
+        tokens = list(iter(lexer.token, None))
+
+        t_clasico, m_clasico = medir(clasico, tokens)
+        t_actual, m_actual = medir(actual, tokens)
+        print(f"{instrucciones:>13} {t_clasico:>13.3f} {t_actual:>11.3f} "
+              f"{m_clasico / 2**20:>14.1f} {m_actual / 2**20:>12.1f} "
+              f"{1 - m_actual / m_clasico:>7.0%}")
+
+if __name__ == "__main__":
+    main()
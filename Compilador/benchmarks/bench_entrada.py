@@ -0,0 +1,67 @@
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+# ----------------------------
+# Memoria máxima (RSS) al analizar fuentes grandes: leyendo el archivo
+# completo con f.read() frente a proyectarlo con mmap y lexear por bloques.
+# Cada medición corre en un proceso nuevo.
+#
+# Las fuentes son programas con muchos comentarios, donde el texto pesa
+# más que los tokens y el árbol (que siguen creciendo con la entrada).
+#
+#   python benchmarks/bench_entrada.py [max_MB]
+# ----------------------------
+
+def escribir_fuente(ruta, megas):
+    comentario = '-- ' + 'x' * 120 + '\n'
+    with open(ruta, 'w', encoding='utf-8') as f:
+        f.write('pf2024 Ejem1\nint a;\nInicio\n')
+        bloque = ('a:=a+1;\n' + comentario * 20) * 64
+        for _ in range(megas * 2**20 // len(bloque)):
+            f.write(bloque)
+        f.write('Fin\n')
+
+def medir(modo, ruta):
+    import Compilador
+    sesion = Compilador.SesionCompilador(salida=Compilador.SalidaMemoria())
+    inicio = time.perf_counter()
+    if modo == 'completo':
+        with open(ruta, 'r', encoding='utf-8') as f:
+            contenido = f.read()
+        sesion.analizar(contenido)
+    else:
+        sesion.analizar_bloques(Compilador.bloques_archivo(ruta))
+    segundos = time.perf_counter() - inicio
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{rss:.1f} {segundos:.3f} {len(sesion.tokens)}")
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == '--medir':
+        return medir(argv[1], argv[2])
+    maximo = int(argv[0]) if argv else 256
+
+    print(f"{'MB':>6} {'tokens':>9} {'f.read() (MB RSS)':>18} {'mmap (MB RSS)':>14} "
+          f"{'f.read() (s)':>13} {'mmap (s)':>9}")
+    with tempfile.TemporaryDirectory() as directorio:
+        for megas in (n for n in (16, 64, 256, 1024) if n <= maximo):
+            ruta = os.path.join(directorio, f'fuente_{megas}.txt')
+            escribir_fuente(ruta, megas)
+            medidas = {}
+            for modo in ('completo', 'bloques'):
+                salida = subprocess.run([sys.executable, os.path.abspath(__file__), '--medir', modo, ruta],
+                                        capture_output=True, text=True, check=True).stdout.split()
+                medidas[modo] = (float(salida[0]), float(salida[1]), int(salida[2]))
+            print(f"{megas:>6} {medidas['bloques'][2]:>9} {medidas['completo'][0]:>18.1f} "
+                  f"{medidas['bloques'][0]:>14.1f} {medidas['completo'][1]:>13.2f} "
+                  f"{medidas['bloques'][1]:>9.2f}")
+            os.remove(ruta)
+
+if __name__ == "__main__":
+    main()
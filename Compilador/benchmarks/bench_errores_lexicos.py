@@ -0,0 +1,47 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import Compilador
+
+# ----------------------------
+# Escalamiento del manejo de errores léxicos: el tiempo por error debe
+# mantenerse constante al crecer el número de errores.
+#
+#   python benchmarks/bench_errores_lexicos.py [max_errores]
+# ----------------------------
+
+LINEA_ERRONEA = "@de@cl@ #pos#ici#on# a := 1 $$;\n"   # 3 errores por línea
+
+def fuente_con_errores(errores):
+    return "pf2024 Ejem1\n" + LINEA_ERRONEA * (errores // 3)
+
+def medir(errores):
+    sesion = Compilador.SesionCompilador(salida=Compilador.SalidaMemoria())
+    contenido = fuente_con_errores(errores)
+
+    inicio = time.perf_counter()
+    sesion._reiniciar()
+    sesion.lexer.input(contenido)
+    for _ in sesion.tokens.registrar(sesion.lexer):
+        pass
+    lexico = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    Compilador.generar_archivo_tok(sesion.tokens, sesion.salida, sesion.errores_lexicos)
+    tok = time.perf_counter() - inicio
+    return len(sesion.errores_lexicos), lexico, tok
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    maximo = int(argv[0]) if argv else 100_000
+    tamanos = [n for n in (1_000, 10_000, 100_000, 1_000_000) if n <= maximo]
+    print(f"{'errores':>10} {'léxico (s)':>12} {'.tok (s)':>10} {'µs/error':>10}")
+    for errores in tamanos:
+        total, lexico, tok = medir(errores)
+        print(f"{total:>10} {lexico:>12.3f} {tok:>10.3f} {1e6 * (lexico + tok) / total:>10.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import filecmp
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import Compilador
+from bench_arbol import programa
+from bench_errores_lexicos import LINEA_ERRONEA
+
+# ----------------------------
+# Escritura de progfte.tok, .tab y .dep: una pasada con escritura por
+# lotes (generar_archivos_tokens) frente a la forma anterior (una pasada
+# por archivo y un write por línea). Compara los archivos byte a byte y
+# mide tiempo, memoria máxima y llamadas write al sistema (/proc/self/io).
+#
+#   python benchmarks/bench_escritura.py [max_instrucciones]
+# ----------------------------
+
+def escribir_clasico(tokens, salida, errores_lexicos):
+    indice_errores = {}
+    for e in errores_lexicos:
+        indice_errores.setdefault((e['value'], e['line']), e)
+    with Compilador._abrir_salida(salida, 'progfte.tok') as f:
+        for tipo, valor, linea in tokens:
+            line = f"Renglón: {linea:<7} Lexema: {valor:<15} Token: {tipo}"
+            if tipo in Compilador.TIPOS_ERROR_LEXICO:
+                error_info = indice_errores.get((valor, linea))
+                if error_info:
+                    line += f" (Error: {error_info.get('msg', 'Error léxico')})"
+            f.write(line + "\n")
+
+    with Compilador._abrir_salida(salida, 'progfte.tab') as f:
+        f.write("{:<8} {:<20} {:<50} {:<15}\n".format("No", "Lexema", "Token", "Referencia"))
+        f.write("-"*93 + "\n")
+        validos = [(t, v) for t, v, _ in tokens if t not in Compilador.TIPOS_ERROR_LEXICO]
+        for i, (tipo, valor) in enumerate(validos, 1):
+            f.write("{:<8} {:<20} {:<50} {:<15}\n".format(
+                i, valor, tipo, Compilador.CODIGOS_TOKEN.get(tipo, 999)))
+
+    depurado = []
+    tipos = [t for t, _, _ in tokens]
+    valores = [v for _, v, _ in tokens]
+    i, n = 0, len(tipos)
+    while i < n:
+        if tipos[i] == 'PALABRA_RESERVADA_FIN':
+            depurado.append('Fin')
+            break
+        if tipos[i] == 'COMA':
+            depurado.append(',')
+        elif (i + 2 < n and tipos[i] == 'IDENTIFICADOR' and tipos[i+1] in ['IGUAL', 'ASIGNACION']
+              and tipos[i+2] in ['NUMERO', 'IDENTIFICADOR', 'PARENTESIS_IZQ']):
+            depurado.append(f"{valores[i]}{valores[i+1]}{valores[i+2]}")
+            i += 3
+            continue
+        else:
+            depurado.append(str(valores[i]))
+        i += 1
+    with Compilador._abrir_salida(salida, 'progfte.dep') as f:
+        f.write(''.join(depurado))
+
+def llamadas_write():
+    try:
+        with open('/proc/self/io') as f:
+            return int(next(l for l in f if l.startswith('syscw')).split()[1])
+    except (OSError, StopIteration):
+        return 0
+
+def medir(escribir, tokens, errores, directorio):
+    # El tiempo se mide sin tracemalloc (que encarece cada asignación)
+    antes = llamadas_write()
+    inicio = time.perf_counter()
+    escribir(tokens, directorio, errores)
+    segundos = time.perf_counter() - inicio
+    llamadas = llamadas_write() - antes
+
+    tracemalloc.start()
+    escribir(tokens, directorio, errores)
+    memoria = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return segundos, memoria, llamadas
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    maximo = int(argv[0]) if argv else 200_000
+
+    print(f"{'instrucciones':>13} {'anterior (s)':>13} {'actual (s)':>11} {'anterior (MB)':>14} "
+          f"{'actual (MB)':>12} {'write anterior':>15} {'write actual':>13}")
+    with tempfile.TemporaryDirectory() as directorio:
+        for instrucciones in (n for n in (1_000, 10_000, 50_000, 200_000, 1_000_000) if n <= maximo):
+            contenido = programa(instrucciones).replace('Inicio\n', 'Inicio\n' + LINEA_ERRONEA * 100)
+            sesion = Compilador.SesionCompilador(salida=Compilador.SalidaMemoria())
+            sesion.lexer.input(contenido)
+            for _ in sesion.tokens.registrar(sesion.lexer):
+                pass
+
+            clasico = os.path.join(directorio, 'anterior')
+            actual = os.path.join(directorio, 'actual')
+            medidas = [medir(escribir_clasico, sesion.tokens, sesion.errores_lexicos, clasico),
+                       medir(Compilador.generar_archivos_tokens, sesion.tokens,
+                             sesion.errores_lexicos, actual)]
+            for nombre in Compilador.ARCHIVOS_TOKENS:
+                if not filecmp.cmp(os.path.join(clasico, nombre), os.path.join(actual, nombre),
+                                   shallow=False):
+                    print(f"DIFERENCIA en {nombre}")
+                    return 1
+            (t_a, m_a, w_a), (t_b, m_b, w_b) = medidas
+            print(f"{instrucciones:>13} {t_a:>13.3f} {t_b:>11.3f} {m_a / 2**20:>14.1f} "
+                  f"{m_b / 2**20:>12.1f} {w_a:>15} {w_b:>13}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import Compilador
+from benchmarks.bench_arbol import programa
+
+# ----------------------------
+# Latencia de reanálisis tras editar un renglón: análisis incremental
+# frente a un análisis completo del mismo texto.
+#
+#   python benchmarks/bench_incremental.py [max_instrucciones]
+# ----------------------------
+
+def medir(instrucciones):
+    lineas = programa(instrucciones).split('\n')
+    incremental = Compilador.AnalizadorIncremental()
+    incremental.analizar('\n'.join(lineas))
+
+    # Se edita una instrucción a mitad del cuerpo
+    medio = len(lineas) - instrucciones // 2
+    lineas[medio] = 'v0:=(v1+2)*v0;'
+    texto = '\n'.join(lineas)
+
+    inicio = time.perf_counter()
+    incremental.actualizar(texto)
+    t_incremental = time.perf_counter() - inicio
+
+    completo = Compilador.SesionCompilador(salida=Compilador.SalidaMemoria())
+    inicio = time.perf_counter()
+    completo.analizar(texto)
+    t_completo = time.perf_counter() - inicio
+    return t_incremental, t_completo
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    maximo = int(argv[0]) if argv else 100_000
+    print(f"{'instrucciones':>13} {'incremental (ms)':>17} {'completo (ms)':>14} {'aceleración':>12}")
+    for instrucciones in (n for n in (1_000, 10_000, 100_000, 1_000_000) if n <= maximo):
+        t_incremental, t_completo = medir(instrucciones)
+        print(f"{instrucciones:>13} {1e3 * t_incremental:>17.2f} {1e3 * t_completo:>14.1f} "
+              f"{t_completo / t_incremental:>11.0f}x")
+
+if __name__ == "__main__":
+    main()
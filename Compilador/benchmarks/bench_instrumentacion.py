@@ -0,0 +1,46 @@
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import Compilador
+from bench_arbol import programa
+
+# ----------------------------
+# Costo de la instrumentación: compilación completa (análisis y archivos
+# de salida en memoria) sin Instrumentacion frente a con ella, y el
+# reporte por fases de la última medición.
+#
+#   python benchmarks/bench_instrumentacion.py [instrucciones] [repeticiones]
+# ----------------------------
+
+def compilar(contenido, instrumentacion):
+    sesion = Compilador.SesionCompilador(salida=Compilador.SalidaMemoria(),
+                                         instrumentacion=instrumentacion)
+    inicio = time.perf_counter()
+    sesion.analizar(contenido)
+    sesion.generar_archivos()
+    return time.perf_counter() - inicio, sesion
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    instrucciones = int(argv[0]) if argv else 50_000
+    repeticiones = int(argv[1]) if len(argv) > 1 else 3
+    contenido = programa(instrucciones)
+
+    fases = []
+    instrumentacion = Compilador.Instrumentacion(ganchos=[lambda evento, datos: fases.append(datos)])
+    sin = min(compilar(contenido, None)[0] for _ in range(repeticiones))
+    con = min(compilar(contenido, instrumentacion)[0] for _ in range(repeticiones))
+    _, sesion = compilar(contenido, instrumentacion)
+
+    print(f"{instrucciones} instrucciones, mejor de {repeticiones}")
+    print(f"{'sin instrumentación (s)':>24} {'con instrumentación (s)':>24} {'diferencia':>11}")
+    print(f"{sin:>24.3f} {con:>24.3f} {con / sin - 1:>11.1%}\n")
+    print(json.dumps(sesion.estadisticas.como_diccionario(), ensure_ascii=False, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
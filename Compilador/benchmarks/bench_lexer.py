@@ -0,0 +1,97 @@
+import glob
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from ply import lex
+
+import Compilador
+from bench_arbol import programa
+
+# ----------------------------
+# Motor léxico rápido frente a las reglas de PLY.
+#
+# Primero comprueba que ambos producen exactamente los mismos tokens
+# (tipo, valor, línea y posición), errores léxicos y excepciones sobre los
+# ejemplos del repositorio y sobre textos aleatorios; después mide tokens
+# por segundo.
+#
+#   python benchmarks/bench_lexer.py [max_instrucciones]
+# ----------------------------
+
+# Fragmentos con todos los casos del lexer: comillas rectas y tipográficas,
+# comentarios con y sin salto final, acentos, errores y números
+FRAGMENTOS = ['pf2024', 'Ejem1', 'Inicio', 'Fin', 'impcad', 'leerdig', 'int', 'Cad', 'Bool',
+              'año', 'Ñandú', '_x1', 'v9', '0', '42', '007', '٣', '+', '-', '*', '/', '=',
+              ':=', ':', ';', ',', '(', ')', '"', '“', '”', '"hola"', '“hola”', '-- nota',
+              '--', '@', '#$%', '¿que?', 'ü', 'x@y', '12abc', ' ', '  ', '\t', '\n', '\n\n']
+
+def lexear(motor, contenido):
+    lexer = Compilador.MOTORES_LEXICOS[motor].clone()
+    lexer.errores_lexicos = []
+    lexer.lineno = 1
+    lexer.input(contenido)
+    tokens = []
+    try:
+        for tok in lexer:
+            tokens.append((tok.type, tok.value, tok.lineno, tok.lexpos))
+        excepcion = None
+    except lex.LexError as e:
+        excepcion = (str(e), e.text)
+    return tokens, lexer.errores_lexicos, excepcion
+
+def casos(aleatorios):
+    directorio = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+    for ruta in sorted(glob.glob(os.path.join(directorio, '*.txt'))):
+        with open(ruta, 'r', encoding='utf-8') as f:
+            yield os.path.basename(ruta), f.read()
+    yield 'programa(1000)', programa(1000)
+    yield 'retorno de carro', 'pf2024 Ejem1\nint a;\r\nInicio\nFin\n'
+    azar = random.Random(2024)
+    for n in range(aleatorios):
+        yield f'aleatorio {n}', ''.join(azar.choice(FRAGMENTOS) for _ in range(azar.randint(1, 200)))
+
+def verificar(aleatorios=2000):
+    diferencias = 0
+    for nombre, contenido in casos(aleatorios):
+        if lexear('ply', contenido) != lexear('rapido', contenido):
+            diferencias += 1
+            print(f"DIFERENCIA en {nombre}: {contenido!r}")
+    return diferencias
+
+def medir(motor, contenido, repeticiones=3):
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        lexer = Compilador.MOTORES_LEXICOS[motor].clone()
+        lexer.errores_lexicos = []
+        inicio = time.perf_counter()
+        lexer.input(contenido)
+        tokens = list(lexer)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return len(tokens), mejor
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    maximo = int(argv[0]) if argv else 200_000
+
+    diferencias = verificar()
+    if diferencias:
+        print(f"{diferencias} casos con diferencias")
+        return 1
+    print("Ambos motores producen la misma salida\n")
+
+    print(f"{'instrucciones':>13} {'tokens':>9} {'PLY (tok/s)':>13} "
+          f"{'rápido (tok/s)':>15} {'aceleración':>12}")
+    for instrucciones in (n for n in (1_000, 10_000, 50_000, 200_000, 1_000_000) if n <= maximo):
+        contenido = programa(instrucciones)
+        n_tokens, t_ply = medir('ply', contenido)
+        _, t_rapido = medir('rapido', contenido)
+        print(f"{instrucciones:>13} {n_tokens:>9} {n_tokens / t_ply:>13,.0f} "
+              f"{n_tokens / t_rapido:>15,.0f} {t_ply / t_rapido:>11.1f}x")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import Compilador
+from bench_arbol import programa
+from bench_errores_lexicos import LINEA_ERRONEA
+
+# ----------------------------
+# Análisis léxico de un solo archivo grande repartido entre procesos.
+#
+# Comprueba que la tabla de tokens y los errores léxicos son idénticos a
+# los del lexer secuencial (con bloques pequeños, para que muchos cortes
+# caigan junto a comillas y comentarios) y mide la aceleración según el
+# número de procesos.
+#
+#   python benchmarks/bench_lexer_paralelo.py [instrucciones] [procesos ...]
+# ----------------------------
+
+def fuente(instrucciones):
+    # Programa limpio intercalado con renglones erróneos y comillas
+    lineas = programa(instrucciones).split('\n')
+    for i in range(7, len(lineas), 50):
+        lineas[i] += ' ' + LINEA_ERRONEA.strip() + ' “texto” "otro" -- comentario'
+    return '\n'.join(lineas)
+
+def secuencial(contenido):
+    lexer = Compilador.lexer_rapido.clone()
+    lexer.errores_lexicos = errores = []
+    lexer.input(contenido)
+    tabla = Compilador.TablaTokens()
+    for _ in tabla.registrar(lexer):
+        pass
+    return tabla, errores
+
+def paralelo(contenido, ejecutor, procesos, tamano_bloque=Compilador.TAMANO_BLOQUE):
+    tabla = Compilador.TablaTokens()
+    errores = []
+    bloques = Compilador.partir_en_bloques(contenido, tamano_bloque)
+    for tabla_bloque, errores_bloque, _ in Compilador.lexear_en_paralelo(bloques, ejecutor,
+                                                                      en_vuelo=2 * procesos):
+        tabla.extender(tabla_bloque)
+        errores.extend(errores_bloque)
+    return tabla, errores
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    instrucciones = int(argv[0]) if argv else 500_000
+    nucleos = os.cpu_count() or 1
+    cuenta = [int(n) for n in argv[1:]] or sorted({n for n in (1, 2, 4, 8, 16, 32) if n <= nucleos}
+                                                  | {nucleos})
+    contenido = fuente(instrucciones)
+
+    inicio = time.perf_counter()
+    esperado = secuencial(contenido)
+    t_secuencial = time.perf_counter() - inicio
+
+    with ProcessPoolExecutor(max_workers=2) as ejecutor:
+        if paralelo(contenido, ejecutor, 2, tamano_bloque=997) != esperado:
+            print("DIFERENCIA entre el lexer paralelo y el secuencial")
+            return 1
+    print(f"Salida idéntica a la secuencial ({len(esperado[0])} tokens, "
+          f"{len(esperado[1])} errores, {nucleos} núcleos disponibles)\n")
+
+    print(f"{'procesos':>8} {'segundos':>9} {'tokens/s':>12} {'aceleración':>12}")
+    print(f"{'secuen.':>8} {t_secuencial:>9.3f} {len(esperado[0]) / t_secuencial:>12,.0f} {1:>11.2f}x")
+    for procesos in cuenta:
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            ejecutor.submit(int).result()  # Arranque del pool fuera de la medición
+            inicio = time.perf_counter()
+            paralelo(contenido, ejecutor, procesos)
+            segundos = time.perf_counter() - inicio
+        print(f"{procesos:>8} {segundos:>9.3f} {len(esperado[0]) / segundos:>12,.0f} "
+              f"{t_secuencial / segundos:>11.2f}x")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
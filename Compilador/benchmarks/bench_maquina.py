@@ -0,0 +1,149 @@
+import gc
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import Compilador
+import maquina_virtual
+from cache_resultados import CacheResultados
+
+# ----------------------------
+# Ejecución de programas: máquina virtual (código de bytes) frente a un
+# intérprete recursivo que recorre el árbol. Comprueba que ambos producen
+# las mismas salidas y variables.
+#
+# Las primeras columnas miden una ejecución de principio a fin desde el
+# archivo fuente, como maquina_virtual.py: 'árbol' analiza y recorre el
+# árbol; '1ª vez' analiza, traduce, guarda en la caché y ejecuta; 'con
+# caché' lee el código de bytes ya guardado y ejecuta. Al final, la
+# traducción sola y la ejecución sola de cada lado ('por ejecución').
+#
+#   python benchmarks/bench_maquina.py [max_instrucciones] [repeticiones]
+# ----------------------------
+
+def programa_ejecutable(instrucciones):
+    # Expresiones con las cuatro operaciones cuyos valores se mantienen
+    # acotados (sin divisiones entre cero)
+    variables = max(4, instrucciones // 20)
+    lineas = ['pf2024 Ejem1', f'int {", ".join(f"v{i}" for i in range(variables))};',
+              'int k = 7;', 'Inicio']
+    for i in range(instrucciones):
+        a, b, c, d = i % variables, (i * 7) % variables, (i * 13) % variables, (i * 5) % variables
+        lineas.append((f'v{a}:=(v{b}*3+v{c})/(k+2)-v{d}/5+{i % 50};',
+                       f'v{a}:=v{b}-(v{c}+{i % 9})*2/(4+k)+k*(v{d}/7);',
+                       f'leerdig(v{a});',
+                       f'v{a}:=(v{b}+v{c}+v{d})/3;',
+                       f'impcad(v{b});')[i % 5])
+    lineas.append('Fin')
+    return '\n'.join(lineas) + '\n'
+
+def evaluar(nodo, entorno):
+    # Intérprete recursivo de referencia
+    if nodo.tipo == 'NUMERO':
+        return nodo.valor
+    if nodo.tipo == 'ID':
+        return entorno.get(nodo.valor, 0)
+    izquierda = evaluar(nodo.hijos[0], entorno)
+    derecha = evaluar(nodo.hijos[1], entorno)
+    if nodo.tipo == '+':
+        return izquierda + derecha
+    if nodo.tipo == '-':
+        return izquierda - derecha
+    if nodo.tipo == '*':
+        return izquierda * derecha
+    return maquina_virtual.dividir(izquierda, derecha)
+
+def ejecutar_arbol(arbol, entrada, salida):
+    entorno = {}
+    for seccion in arbol.hijos:
+        if seccion.tipo == 'DECLARACIONES':
+            for declaracion in seccion.hijos:
+                if declaracion.tipo == 'DECLARACION':
+                    for id_ in declaracion.hijos[1].hijos:
+                        entorno[id_.valor] = maquina_virtual.VALOR_INICIAL[declaracion.hijos[0].valor]
+                else:
+                    entorno[declaracion.hijos[1].valor] = evaluar(declaracion.hijos[2], entorno)
+        elif seccion.tipo == 'BLOQUE':
+            for nodo in seccion.hijos[0].hijos:
+                if nodo.tipo == 'ASIGNACION':
+                    entorno[nodo.hijos[0].valor] = evaluar(nodo.hijos[1], entorno)
+                elif nodo.tipo == 'LEER':
+                    entorno[nodo.hijos[0].valor] = int(entrada())
+                else:
+                    salida(entorno.get(nodo.hijos[0].valor, 0))
+    return entorno
+
+def entradas():
+    valores = iter(range(10**9))
+    return lambda: next(valores) % 1000
+
+def ejecutar_maquina(programa):
+    salidas = []
+    variables = maquina_virtual.MaquinaVirtual(entradas(), salidas.append).ejecutar(programa)
+    return salidas, variables
+
+def cronometrar(funcion, *args, repeticiones=1):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        resultado = funcion(*args)
+    return resultado, (time.perf_counter() - inicio) / repeticiones
+
+def medir(ruta, directorio_cache, repeticiones):
+    # Tiempos de principio a fin (el análisis una sola vez: tarda mucho
+    # más que el resto y casi no varía)
+    sesion = Compilador.SesionCompilador(salida=Compilador.SalidaMemoria())
+    arbol, t_analisis = cronometrar(sesion.analizar_bloques, Compilador.bloques_archivo(ruta))
+    if sesion.errores_lexicos or sesion.errores_sintacticos:
+        raise ValueError("El programa generado tiene errores")
+    salidas = []
+    ejecutar = lambda: (salidas.clear(), ejecutar_arbol(arbol, entradas(), salidas.append))[1]
+    variables_arbol, t_arbol = cronometrar(ejecutar, repeticiones=repeticiones)
+    _, t_traduccion = cronometrar(maquina_virtual.compilar_bytecode, arbol)
+    # El árbol se libera antes de medir la máquina: con él vivo, el
+    # recolector encarece el segundo análisis
+    del sesion, arbol
+    gc.collect()
+
+    cache = CacheResultados(directorio_cache, version=Compilador.version_compilador())
+    (programa, _), t_primera = cronometrar(maquina_virtual.traducir_archivo, ruta, cache)
+    (salidas_maquina, variables_maquina), t_maquina = cronometrar(
+        ejecutar_maquina, programa, repeticiones=repeticiones)
+    (guardado, _), t_cargar = cronometrar(maquina_virtual.traducir_archivo, ruta, cache,
+                                          repeticiones=repeticiones)
+    iguales = (salidas == salidas_maquina and variables_arbol == variables_maquina
+               and ejecutar_maquina(guardado) == (salidas_maquina, variables_maquina))
+    return {'iguales': iguales, 'bytecode': len(programa), 'arbol': t_analisis + t_arbol,
+            'primera': t_primera + t_maquina, 'cache': t_cargar + t_maquina,
+            'traduccion': t_traduccion, 'recorrido': t_arbol, 'maquina': t_maquina}
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    maximo = int(argv[0]) if argv else 200_000
+    repeticiones = int(argv[1]) if len(argv) > 1 else 3
+
+    print(f"{'instrucciones':>13} {'bytecode':>9} {'árbol (s)':>10} {'1ª vez (s)':>11} "
+          f"{'con caché (s)':>14} {'con caché':>10} {'1ª vez':>7} {'traducción (s)':>15} "
+          f"{'por ejecución':>14}")
+    with tempfile.TemporaryDirectory() as directorio:
+        for instrucciones in (n for n in (1_000, 10_000, 50_000, 200_000, 1_000_000)
+                              if n <= maximo):
+            ruta = os.path.join(directorio, f'programa_{instrucciones}.txt')
+            with open(ruta, 'w', encoding='utf-8') as f:
+                f.write(programa_ejecutable(instrucciones))
+            gc.collect()  # Sin basura de la medición anterior
+            medida = medir(ruta, os.path.join(directorio, f'cache_{instrucciones}'), repeticiones)
+            if not medida['iguales']:
+                print(f"DIFERENCIA entre la máquina y el intérprete del árbol ({instrucciones})")
+                return 1
+            print(f"{instrucciones:>13} {medida['bytecode']:>9} {medida['arbol']:>10.3f} "
+                  f"{medida['primera']:>11.3f} {medida['cache']:>14.3f} "
+                  f"{medida['arbol'] / medida['cache']:>9.1f}x "
+                  f"{medida['arbol'] / medida['primera']:>6.2f}x {medida['traduccion']:>15.3f} "
+                  f"{medida['recorrido'] / medida['maquina']:>13.2f}x")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
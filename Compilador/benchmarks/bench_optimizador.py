@@ -0,0 +1,76 @@
+import gc
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import Compilador
+import maquina_virtual
+import optimizador
+from generador import generar, tamano_en_bytes
+
+# ----------------------------
+# Pases de optimización del árbol: nodos eliminados por cada pase, su
+# costo y el tiempo que ahorran después (escritura de progfte.arb y
+# traducción a código de bytes).
+#
+#   python benchmarks/bench_optimizador.py [tamaño] [forma]
+#
+# Además de las formas del generador, 'repetido' produce instrucciones con
+# subexpresiones repetidas y asignaciones sobrescritas.
+# ----------------------------
+
+def programa_repetido(tamano):
+    lineas = ['pf2024 Ejem1', 'int ' + ', '.join(f'v{i}' for i in range(100)) + ';', 'Inicio']
+    total, i = 0, 0
+    while total < tamano:
+        a, b, c = i % 100, (i * 7) % 100, (i * 13) % 100
+        linea = (f'v{a}:=(v{b}+v{c})*(v{b}-v{c})+(v{b}+v{c})*(v{b}-v{c})*2;\n'
+                 f'v{c}:=(v{b}+v{c})*(v{b}-v{c})-(2*3+4);\n'
+                 f'v{b}:=v{a}+1;\n')
+        lineas.append(linea)
+        total += len(linea)
+        i += 1
+    lineas.append('Fin')
+    return '\n'.join(lineas) + '\n'
+
+def analizar(contenido, pases):
+    sesion = Compilador.SesionCompilador(salida=Compilador.SalidaMemoria(), optimizaciones=pases)
+    sesion.analizar(contenido)
+    return sesion
+
+def posteriores(sesion):
+    gc.collect()  # Sin basura de la medición anterior
+    inicio = time.perf_counter()
+    Compilador.generar_arbol_sintactico(sesion.arbol, sesion.salida)
+    maquina_virtual.compilar_bytecode(sesion.arbol)
+    return time.perf_counter() - inicio
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    tamano = tamano_en_bytes(argv[0] if argv else '4M')
+    forma = argv[1] if len(argv) > 1 else 'mixto'
+    contenido = programa_repetido(tamano) if forma == 'repetido' else ''.join(generar(tamano, forma))
+
+    base = analizar(contenido, None)
+    nodos = Compilador.contar_nodos(base.arbol)
+    t_base = posteriores(base)
+    del base
+    print(f"{forma}, {len(contenido.encode('utf-8')) / 2**20:.1f} MB, {nodos} nodos\n")
+    print(f"{'pases':<42} {'eliminados':>11} {'%':>6} {'optimizar (s)':>14} "
+          f"{'posteriores (s)':>16}")
+    print(f"{'(ninguno)':<42} {0:>11} {0:>6.1%} {0:>14.3f} {t_base:>16.3f}")
+    combinaciones = [(pase,) for pase in optimizador.PASES] + [optimizador.PASES]
+    for pases in combinaciones:
+        sesion = analizar(contenido, None)
+        inicio = time.perf_counter()
+        estadisticas = optimizador.optimizar(sesion.arbol, pases)
+        t_optimizar = time.perf_counter() - inicio
+        eliminados = sum(datos['nodos_eliminados'] for datos in estadisticas.values())
+        print(f"{'+'.join(pases):<42} {eliminados:>11} {eliminados / nodos:>6.1%} "
+              f"{t_optimizar:>14.3f} {posteriores(sesion):>16.3f}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
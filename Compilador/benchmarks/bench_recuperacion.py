@@ -0,0 +1,71 @@
+import gc
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import Compilador
+from generador import generar, tamano_en_bytes
+
+# ----------------------------
+# Recuperación de errores sintácticos: velocidad del análisis con entradas
+# llenas de errores comparada con la de un programa correcto del mismo
+# tamaño. 'basura' son renglones de tokens al azar dentro del bloque.
+#
+#   python benchmarks/bench_recuperacion.py [tamaño]
+# ----------------------------
+
+SIMBOLOS = 'abc xyz 123 := ; + - * / ( ) @ # $ int Cad leerdig impcad , ='.split()
+
+def programa_basura(tamano, semilla=0):
+    azar = random.Random(semilla)
+    lineas = ['pf2024 Ejem1', 'int abc, xyz;', 'Inicio']
+    total = 0
+    while total < tamano:
+        linea = ' '.join(azar.choice(SIMBOLOS) for _ in range(8))
+        lineas.append(linea)
+        total += len(linea) + 1
+    lineas.append('Fin')
+    return '\n'.join(lineas) + '\n'
+
+def programa_correcto(tamano):
+    # 'instrucciones' sin los impcad(“...”), que el parser rechaza
+    return ''.join(linea for trozo in generar(tamano, 'instrucciones')
+                   for linea in trozo.splitlines(True) if '“' not in linea)
+
+def medir(contenido):
+    sesion = Compilador.SesionCompilador(salida=Compilador.SalidaMemoria())
+    gc.collect()  # Sin basura de la medición anterior
+    inicio = time.perf_counter()
+    sesion.analizar(contenido)
+    segundos = time.perf_counter() - inicio
+    return sesion, segundos
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    tamano = tamano_en_bytes(argv[0] if argv else '2M')
+    entradas = (
+        ('correcto', programa_correcto(tamano)),
+        ('mixto', ''.join(generar(tamano, 'mixto'))),
+        ('errores', ''.join(generar(tamano, 'errores'))),
+        ('basura', programa_basura(tamano)),
+    )
+
+    print(f"{'entrada':<10} {'MB':>6} {'MB/s':>7} {'vs correcto':>12} {'léxicos':>9} "
+          f"{'sintácticos':>12} {'nodos':>9}")
+    referencia = None
+    for nombre, contenido in entradas:
+        megas = len(contenido.encode('utf-8')) / 2**20
+        sesion, segundos = medir(contenido)
+        velocidad = megas / segundos
+        referencia = referencia or velocidad
+        print(f"{nombre:<10} {megas:>6.1f} {velocidad:>7.2f} {velocidad / referencia:>11.2f}x "
+              f"{len(sesion.errores_lexicos):>9} {len(sesion.errores_sintacticos):>12} "
+              f"{Compilador.contar_nodos(sesion.arbol):>9}")
+        del sesion
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
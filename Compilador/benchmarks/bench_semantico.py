@@ -0,0 +1,56 @@
+import gc
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import Compilador
+
+# ----------------------------
+# Análisis semántico con muchas declaraciones: el tiempo por ID debe
+# mantenerse constante al crecer la tabla de símbolos (sin costo
+# cuadrático).
+#
+#   python benchmarks/bench_semantico.py [max_declaraciones]
+# ----------------------------
+
+def programa_declaraciones(declaraciones):
+    # Una instrucción por declaración, con usos repartidos por toda la
+    # tabla, algunas variables no declaradas y asignaciones de otro tipo
+    lineas = ['pf2024 Ejem1']
+    for i in range(declaraciones):
+        lineas.append(f'Cad v{i};' if i % 10 == 0 else f'int v{i};')
+    lineas.append('Inicio')
+    for i in range(declaraciones):
+        a, b, c = (i * 7) % declaraciones, (i * 13) % declaraciones, (i * 31) % declaraciones
+        if i % 1000 == 999:
+            lineas.append(f'leerdig(w{i});')
+        else:
+            lineas.append(f'v{a}:=v{b}+v{c}*2;')
+    lineas.append('Fin')
+    return '\n'.join(lineas) + '\n'
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    maximo = int(argv[0]) if argv else 500_000
+
+    print(f"{'declaraciones':>13} {'IDs':>9} {'errores':>8} {'semántico (s)':>14} "
+          f"{'µs por ID':>10}")
+    for declaraciones in (n for n in (10_000, 50_000, 100_000, 250_000, 500_000, 1_000_000)
+                          if n <= maximo):
+        sesion = Compilador.SesionCompilador(salida=Compilador.SalidaMemoria())
+        sesion.analizar(programa_declaraciones(declaraciones))
+        gc.collect()  # Sin basura del análisis sintáctico
+        errores = []
+        inicio = time.perf_counter()
+        tabla = Compilador.analizar_semantica(sesion.arbol, errores)
+        segundos = time.perf_counter() - inicio
+        ids = len(tabla.referencias)
+        print(f"{declaraciones:>13} {ids:>9} {len(errores):>8} {segundos:>14.3f} "
+              f"{segundos / ids * 1e6:>10.3f}")
+        del sesion, tabla, errores
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
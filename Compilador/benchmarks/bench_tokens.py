@@ -0,0 +1,67 @@
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import Compilador
+from bench_arbol import programa
+
+# ----------------------------
+# Memoria de los tokens analizados: lista de diccionarios (representación
+# anterior) frente a TablaTokens (columnas en array), y tiempo de los
+# archivos de salida que los recorren.
+#
+#   python benchmarks/bench_tokens.py [max_instrucciones]
+# ----------------------------
+
+def lexear(contenido):
+    lexer = Compilador.lexer_rapido.clone()
+    lexer.errores_lexicos = []
+    lexer.input(contenido)
+    return list(lexer)
+
+def memoria(construir):
+    tracemalloc.start()
+    resultado = construir()
+    usada = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del resultado
+    return usada
+
+def como_diccionarios(tokens_lexer):
+    return [{'type': tok.type, 'value': tok.value, 'line': tok.lineno} for tok in tokens_lexer]
+
+def como_tabla(tokens_lexer):
+    tabla = Compilador.TablaTokens()
+    for tok in tokens_lexer:
+        tabla.agregar(tok.type, tok.value, tok.lineno)
+    return tabla
+
+def escribir(tabla):
+    salida = Compilador.SalidaMemoria()
+    inicio = time.perf_counter()
+    Compilador.generar_archivo_tok(tabla, salida)
+    Compilador.generar_archivo_tab(tabla, salida)
+    Compilador.generar_depuracion(tabla, salida)
+    return time.perf_counter() - inicio
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    maximo = int(argv[0]) if argv else 200_000
+
+    print(f"{'instrucciones':>13} {'tokens':>9} {'dicts (MB)':>11} {'tabla (MB)':>11} "
+          f"{'B/token':>14} {'ahorro':>7} {'escritura (s)':>14}")
+    for instrucciones in (n for n in (1_000, 10_000, 50_000, 200_000, 1_000_000) if n <= maximo):
+        tokens_lexer = lexear(programa(instrucciones))
+        m_dicts = memoria(lambda: como_diccionarios(tokens_lexer))
+        m_tabla = memoria(lambda: como_tabla(tokens_lexer))
+        t_escritura = escribir(como_tabla(tokens_lexer))
+        n = len(tokens_lexer)
+        print(f"{instrucciones:>13} {n:>9} {m_dicts / 2**20:>11.1f} {m_tabla / 2**20:>11.1f} "
+              f"{m_dicts / n:>6.0f} -> {m_tabla / n:>4.0f} {1 - m_tabla / m_dicts:>7.0%} "
+              f"{t_escritura:>14.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+import os
+import random
+import sys
+
+# ----------------------------
+# Generador de programas pf2024 sintéticos de tamaño y forma configurables.
+#
+# Cada forma fija la proporción de declaraciones, la profundidad de los
+# paréntesis en las expresiones y la densidad de ruido erróneo (renglones
+# como '@de@cl@' del ejemplo). La salida es determinista para una semilla.
+#
+#   python benchmarks/generador.py tamaño [forma] [semilla] > programa.txt
+#   (tamaño en bytes, con sufijo K, M o G: 64K, 16M, 1G)
+# ----------------------------
+
+FORMAS = {
+    # forma: (fracción de declaraciones, profundidad máxima, fracción de ruido)
+    'mixto': (0.1, 4, 0.02),
+    'declaraciones': (0.6, 2, 0.0),
+    'instrucciones': (0.01, 3, 0.0),
+    'anidado': (0.02, 40, 0.0),
+    'errores': (0.05, 3, 0.4),
+}
+
+RUIDO = (
+    '@de@cl@ #pos#ici#on#',
+    'int número = 1',
+    'a := 1 $$;',
+    'leerdig(@x@);',
+    '#pos# := ?;',
+)
+
+# impcad(“...”) como en pf2024.txt; el parser actual lo reporta como error
+# de sintaxis (las comillas llegan como COMILLA_IZQ/COMILLA_DER)
+TEXTOS = ('Dame un numero', 'Hola mundo', 'Resultado', 'Fin del calculo')
+
+LINEAS_POR_TROZO = 4096
+
+def tamano_en_bytes(texto):
+    multiplos = {'K': 2**10, 'M': 2**20, 'G': 2**30}
+    texto = str(texto).strip().upper().rstrip('B')
+    if texto and texto[-1] in multiplos:
+        return int(float(texto[:-1]) * multiplos[texto[-1]])
+    return int(texto)
+
+def _expresion(azar, variables, profundidad):
+    if profundidad <= 0 or azar.random() < 0.3:
+        return f'v{azar.randrange(variables)}' if azar.random() < 0.6 else str(azar.randrange(1000))
+    izquierda = _expresion(azar, variables, profundidad - 1)
+    derecha = _expresion(azar, variables, profundidad - 1)
+    expresion = f'{izquierda}{azar.choice("+-*/")}{derecha}'
+    return f'({expresion})' if azar.random() < 0.5 else expresion
+
+def _anidada(azar, variables, profundidad):
+    # Una cadena de paréntesis de la profundidad pedida
+    expresion = f'v{azar.randrange(variables)}'
+    for _ in range(profundidad):
+        expresion = f'({expresion}{azar.choice("+-*/")}{azar.randrange(100)})'
+    return expresion
+
+def _declaracion(azar, indice):
+    eleccion = azar.random()
+    if eleccion < 0.15:
+        return f'Cad v{indice};'
+    if eleccion < 0.25:
+        return f'Bool v{indice};'
+    if eleccion < 0.4:
+        return f'int v{indice} = {azar.randrange(100)};'
+    return f'int v{indice};'
+
+def _instruccion(azar, variables, profundidad, forma):
+    eleccion = azar.random()
+    destino = f'v{azar.randrange(variables)}'
+    if forma == 'anidado' and eleccion < 0.5:
+        return f'{destino}:={_anidada(azar, variables, azar.randint(profundidad // 2, profundidad))};'
+    if eleccion < 0.6:
+        # Limitada a 4 niveles: el tamaño crece exponencialmente con la profundidad
+        return f'{destino}:={_expresion(azar, variables, min(profundidad, 4))};'
+    if eleccion < 0.75:
+        return f'leerdig({destino});'
+    if eleccion < 0.85:
+        return f'impcad({destino});'
+    if eleccion < 0.95:
+        return f'impcad(“{azar.choice(TEXTOS)}”);'
+    return f'{destino}:={destino}+1;    -- comentario --'
+
+def generar(tamano, forma='mixto', semilla=0):
+    # Produce el programa por trozos de texto (para no tenerlo entero en
+    # memoria); el total se acerca a `tamano` bytes en UTF-8
+    fraccion_declaraciones, profundidad, fraccion_ruido = FORMAS[forma]
+    azar = random.Random(semilla)
+    encabezado = 'pf2024 Ejem1            --Encabezado--\n'
+    yield encabezado
+    escritos = len(encabezado)
+
+    # Declaraciones: unos 14 bytes cada una
+    variables = max(1, int(tamano * fraccion_declaraciones) // 14)
+    for desde in range(0, variables, LINEAS_POR_TROZO):
+        trozo = '\n'.join(_declaracion(azar, i)
+                          for i in range(desde, min(variables, desde + LINEAS_POR_TROZO))) + '\n'
+        escritos += len(trozo.encode('utf-8'))
+        yield trozo
+
+    yield 'Inicio\n'
+    escritos += len('Inicio\nFin\n')
+    while escritos < tamano:
+        lineas = []
+        for _ in range(LINEAS_POR_TROZO):
+            if azar.random() < fraccion_ruido:
+                lineas.append(azar.choice(RUIDO))
+            else:
+                lineas.append(_instruccion(azar, variables, profundidad, forma))
+        trozo = '\n'.join(lineas) + '\n'
+        tamano_trozo = len(trozo.encode('utf-8'))
+        if escritos + tamano_trozo > tamano:
+            # Último trozo: solo los renglones que caben
+            trozo = trozo.encode('utf-8')[:tamano - escritos].decode('utf-8', 'ignore')
+            trozo = trozo[:trozo.rfind('\n') + 1]
+            tamano_trozo = len(trozo.encode('utf-8'))
+            if not trozo:
+                break
+        escritos += tamano_trozo
+        yield trozo
+    yield 'Fin\n'
+
+def escribir_programa(ruta, tamano, forma='mixto', semilla=0):
+    with open(ruta, 'w', encoding='utf-8') as f:
+        for trozo in generar(tamano, forma, semilla):
+            f.write(trozo)
+    return os.path.getsize(ruta)
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print(f"uso: generador.py tamaño [{'|'.join(FORMAS)}] [semilla]", file=sys.stderr)
+        return 2
+    tamano = tamano_en_bytes(argv[0])
+    forma = argv[1] if len(argv) > 1 else 'mixto'
+    semilla = int(argv[2]) if len(argv) > 2 else 0
+    salida = open(sys.stdout.fileno(), 'w', encoding='utf-8', closefd=False)
+    for trozo in generar(tamano, forma, semilla):
+        salida.write(trozo)
+    salida.flush()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from generador import FORMAS, escribir_programa, tamano_en_bytes
+
+# ----------------------------
+# Suite de rendimiento: genera programas pf2024 de cada forma y tamaño,
+# los compila con la instrumentación de la sesión (léxico, sintáctico,
+# recuperación de errores y cada archivo de salida por separado) y guarda
+# los resultados en JSON. Con --comparar señala las fases que empeoraron
+# respecto a una ejecución anterior y termina con código 1.
+#
+# Cada medición corre en un proceso nuevo, para que la memoria máxima sea
+# la de esa compilación. Los tamaños grandes necesitan varias veces su
+# tamaño en memoria (tabla de tokens y árbol): 1G requiere decenas de GB.
+#
+#   python benchmarks/suite.py -o resultados.json
+#   python benchmarks/suite.py --tamanos 1K 1M 64M --formas mixto errores
+#   python benchmarks/suite.py -o nuevo.json --comparar resultados.json
+# ----------------------------
+
+TAMANOS = ('1K', '64K', '1M', '16M')
+FASES_ESCRITURA = {
+    'escritura_tok': ('progfte.tok',),
+    'escritura_tab': ('progfte.tab',),
+    'escritura_dep': ('progfte.dep',),
+}
+
+def medir(ruta):
+    # Se ejecuta en el proceso hijo; imprime el reporte de la sesión en JSON
+    import Compilador
+    with tempfile.TemporaryDirectory() as directorio:
+        sesion = Compilador.SesionCompilador(output_dir=directorio, arbol_binario=True,
+                                             instrumentacion=Compilador.Instrumentacion())
+        sesion.analizar_archivo(ruta)
+        # generar_archivos_tokens escribe los tres archivos en una pasada;
+        # aquí se mide además cada uno por separado
+        for fase, archivos in FASES_ESCRITURA.items():
+            with sesion.estadisticas.fase(fase):
+                Compilador.generar_archivos_tokens(sesion.tokens, sesion.salida,
+                                                   sesion.errores_lexicos, archivos)
+        resultado = sesion.estadisticas.como_diccionario()
+    # Cada medición corre en su propio proceso: el pico del proceso es el
+    # de esta compilación
+    resultado['memoria_maxima_proceso'] = Compilador._memoria_maxima_proceso()
+    json.dump(resultado, sys.stdout)
+
+def medir_en_proceso(ruta, repeticiones):
+    # Con varias repeticiones se queda con el menor tiempo de cada fase
+    mejor = None
+    for _ in range(repeticiones):
+        salida = subprocess.run([sys.executable, os.path.abspath(__file__), '--medir', ruta],
+                                capture_output=True, text=True, check=True).stdout
+        resultado = json.loads(salida)
+        if mejor is None:
+            mejor = resultado
+            continue
+        for nombre, fase in resultado['fases'].items():
+            anterior = mejor['fases'].setdefault(nombre, fase)
+            for clave in ('pared', 'cpu'):
+                anterior[clave] = min(anterior[clave], fase[clave])
+    return mejor
+
+def ejecutar(tamanos, formas, repeticiones=1, semilla=0, informar=print):
+    import Compilador
+    resultados = []
+    with tempfile.TemporaryDirectory() as directorio:
+        for forma in formas:
+            for tamano in tamanos:
+                ruta = os.path.join(directorio, f'{forma}_{tamano}.txt')
+                total = escribir_programa(ruta, tamano_en_bytes(tamano), forma, semilla)
+                medida = medir_en_proceso(ruta, repeticiones)
+                os.remove(ruta)
+                medida.pop('archivo', None)
+                medida.pop('mensaje', None)
+                medida.update(forma=forma, tamano=tamano, bytes=total)
+                resultados.append(medida)
+                if informar:
+                    informar(_renglon(medida))
+    return {
+        'version_compilador': Compilador.version_compilador(),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'nucleos': os.cpu_count(),
+        'fecha': datetime.datetime.now().isoformat(timespec='seconds'),
+        'semilla': semilla,
+        'repeticiones': repeticiones,
+        'resultados': resultados,
+    }
+
+def _renglon(medida):
+    fases = medida['fases']
+    tiempo = lambda nombre: fases.get(nombre, {}).get('pared', 0.0)
+    escritura = sum(tiempo(n) for n in ('generar_archivos_tokens', 'generar_arbol_sintactico',
+                                        'generar_arbol_binario'))
+    return (f"{medida['forma']:<14} {medida['tamano']:>6} {medida['tokens']:>11} "
+            f"{tiempo('lexico'):>9.3f} {tiempo('sintactico'):>11.3f} "
+            f"{tiempo('recuperacion_errores'):>10.3f} {escritura:>10.3f} "
+            f"{(medida['memoria_maxima_proceso'] or 0) / 2**20:>8.1f}")
+
+ENCABEZADO = (f"{'forma':<14} {'tamaño':>6} {'tokens':>11} {'léxico':>9} {'sintáctico':>11} "
+              f"{'errores':>10} {'escritura':>10} {'MB max':>8}")
+
+def comparar(anterior, actual, umbral=0.1, minimo=0.05):
+    # Fases cuyo tiempo de pared creció más que `umbral` (fracción); se
+    # ignoran las que duran menos de `minimo` segundos en ambas ejecuciones
+    previos = {(m['forma'], m['tamano']): m for m in anterior['resultados']}
+    regresiones = []
+    for medida in actual['resultados']:
+        previa = previos.get((medida['forma'], medida['tamano']))
+        if previa is None:
+            continue
+        for nombre, fase in medida['fases'].items():
+            antes = previa['fases'].get(nombre)
+            if antes is None or max(antes['pared'], fase['pared']) < minimo:
+                continue
+            cambio = fase['pared'] / antes['pared'] - 1 if antes['pared'] else float('inf')
+            if cambio > umbral:
+                regresiones.append({'forma': medida['forma'], 'tamano': medida['tamano'],
+                                    'fase': nombre, 'antes': antes['pared'],
+                                    'despues': fase['pared'], 'cambio': cambio})
+    return regresiones
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == '--medir':
+        return medir(argv[1])
+
+    argumentos = argparse.ArgumentParser(description="Suite de rendimiento del compilador pf2024")
+    argumentos.add_argument('--tamanos', nargs='+', default=list(TAMANOS),
+                            help="tamaños de fuente (1K ... 1G); por defecto, " + ' '.join(TAMANOS))
+    argumentos.add_argument('--formas', nargs='+', default=list(FORMAS), choices=list(FORMAS))
+    argumentos.add_argument('-r', '--repeticiones', type=int, default=1)
+    argumentos.add_argument('--semilla', type=int, default=0)
+    argumentos.add_argument('-o', '--salida', default=None, help="archivo JSON de resultados")
+    argumentos.add_argument('--comparar', default=None,
+                            help="resultados JSON de una ejecución anterior")
+    argumentos.add_argument('--umbral', type=float, default=0.1,
+                            help="aumento de tiempo tolerado por fase (por defecto, 0.1 = 10%%)")
+    args = argumentos.parse_args(argv)
+
+    print(ENCABEZADO)
+    resultados = ejecutar(args.tamanos, args.formas, args.repeticiones, args.semilla)
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, ensure_ascii=False, indent=2)
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as f:
+            anterior = json.load(f)
+        regresiones = comparar(anterior, resultados, args.umbral)
+        print(f"\n{len(regresiones)} fases más lentas que en {args.comparar} "
+              f"(umbral {args.umbral:.0%})")
+        for r in regresiones:
+            print(f"  {r['forma']:<14} {r['tamano']:>6} {r['fase']:<26} "
+                  f"{r['antes']:.3f} s -> {r['despues']:.3f} s ({r['cambio']:+.0%})")
+        return 1 if regresiones else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+import hashlib
+import os
+import pickle
+import tempfile
+
+# ----------------------------
+# Caché de resultados de compilación
+#
+# Cada entrada se guarda en un archivo cuyo nombre es el hash del código
+# fuente y de la versión del compilador. Las entradas se escriben en un
+# temporal y se publican con os.replace, así que varios procesos pueden
+# compartir el directorio. El uso se marca con la fecha de modificación y,
+# al superar el límite de tamaño, se borran las menos usadas (LRU).
+# ----------------------------
+
+LIMITE_POR_DEFECTO = 512 * 1024 * 1024
+
+class CacheResultados:
+    def __init__(self, directorio, limite_bytes=LIMITE_POR_DEFECTO, version=''):
+        self.directorio = directorio
+        self.limite_bytes = limite_bytes
+        self.version = version
+        self.aciertos = 0
+        self.fallos = 0
+        self.expulsiones = 0
+        self._tamano_estimado = None
+
+    def clave(self, datos, variante=''):
+        # `variante`: opciones que cambian el resultado (p. ej. los pases de
+        # optimización activos)
+        h = hashlib.sha256()
+        h.update(self.version.encode('utf-8'))
+        h.update(b'\0')
+        if variante:
+            h.update(variante.encode('utf-8'))
+            h.update(b'\0')
+        h.update(datos)
+        return h.hexdigest()
+
+    def _ruta(self, clave):
+        return os.path.join(self.directorio, clave[:2], clave + '.pkl')
+
+    def obtener(self, clave):
+        ruta = self._ruta(clave)
+        try:
+            with open(ruta, 'rb') as f:
+                entrada = pickle.load(f)
+        except FileNotFoundError:
+            self.fallos += 1
+            return None
+        except Exception:
+            # Entrada corrupta o de otra versión de las clases: se descarta
+            try:
+                os.remove(ruta)
+            except OSError:
+                pass
+            self.fallos += 1
+            return None
+
+        try:
+            os.utime(ruta)  # Uso reciente para el orden LRU
+        except OSError:
+            pass
+        self.aciertos += 1
+        return entrada
+
+    def guardar(self, clave, entrada):
+        ruta = self._ruta(clave)
+        directorio = os.path.dirname(ruta)
+        os.makedirs(directorio, exist_ok=True)
+
+        descriptor, temporal = tempfile.mkstemp(dir=directorio, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as f:
+                pickle.dump(entrada, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporal, ruta)
+        except BaseException:
+            try:
+                os.remove(temporal)
+            except OSError:
+                pass
+            raise
+
+        if self._tamano_estimado is not None:
+            self._tamano_estimado += os.path.getsize(ruta)
+        if self._tamano_estimado is None or self._tamano_estimado > self.limite_bytes:
+            self._expulsar()
+
+    def _expulsar(self):
+        # Se recorre el directorio solo cuando el tamaño estimado supera el
+        # límite (otros procesos también escriben, así que es aproximado)
+        entradas = []
+        total = 0
+        for raiz, _, archivos in os.walk(self.directorio):
+            for nombre in archivos:
+                if not nombre.endswith('.pkl'):
+                    continue
+                ruta = os.path.join(raiz, nombre)
+                try:
+                    estado = os.stat(ruta)
+                except OSError:
+                    continue
+                entradas.append((estado.st_mtime, estado.st_size, ruta))
+                total += estado.st_size
+
+        entradas.sort()
+        for _, tamano, ruta in entradas:
+            if total <= self.limite_bytes:
+                break
+            try:
+                os.remove(ruta)
+                self.expulsiones += 1
+            except FileNotFoundError:
+                pass  # Otro proceso ya la borró
+            total -= tamano
+        self._tamano_estimado = total
+
+    def estadisticas(self):
+        consultas = self.aciertos + self.fallos
+        return {
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'expulsiones': self.expulsiones,
+            'tasa_aciertos': self.aciertos / consultas if consultas else 0.0,
+        }
@@ -0,0 +1,186 @@
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# ----------------------------
+# Compilación por lotes (sin interfaz gráfica)
+#
+#   python compilar_lote.py fuentes/ otros/*.txt -o salida -j 8
+# ----------------------------
+
+_sesion = None
+
+def _iniciar_trabajador(arbol_binario=False, directorio_cache=None, limite_cache=None,
+                        estadisticas=False, optimizaciones=None, limite_errores=None):
+    # Se ejecuta una vez por proceso: importar Compilador carga las tablas
+    # LALR y la sesión se reutiliza para todos los archivos del trabajador
+    global _sesion
+    import Compilador
+    cache = None
+    if directorio_cache:
+        from cache_resultados import CacheResultados, LIMITE_POR_DEFECTO
+        cache = CacheResultados(directorio_cache,
+                                LIMITE_POR_DEFECTO if limite_cache is None else limite_cache,
+                                Compilador.version_compilador())
+    instrumentacion = Compilador.Instrumentacion(reporte_json=True) if estadisticas else None
+    _sesion = Compilador.SesionCompilador(salida=Compilador.SalidaDirectorio(os.curdir),
+                                          arbol_binario=arbol_binario, cache=cache,
+                                          instrumentacion=instrumentacion,
+                                          optimizaciones=optimizaciones,
+                                          limite_errores=limite_errores)
+
+def _compilar(archivo, output_dir):
+    import Compilador
+    inicio = time.perf_counter()
+    _sesion.salida = Compilador.SalidaDirectorio(output_dir)
+    ok, mensaje = _sesion.analizar_archivo(archivo)
+    return {
+        'archivo': archivo,
+        'salida': output_dir,
+        'ok': ok,
+        'mensaje': mensaje,
+        'tokens': len(_sesion.tokens),
+        'errores_lexicos': len(_sesion.errores_lexicos),
+        'errores_sintacticos': len(_sesion.errores_sintacticos),
+        'errores_semanticos': len(_sesion.errores_semanticos),
+        'desde_cache': _sesion.desde_cache,
+        'segundos': time.perf_counter() - inicio,
+    }
+
+def buscar_fuentes(entradas):
+    # Acepta archivos, directorios (todos sus .txt) y patrones glob
+    fuentes = []
+    for entrada in entradas:
+        if os.path.isdir(entrada):
+            fuentes.extend(sorted(glob.glob(os.path.join(entrada, '*.txt'))))
+        elif os.path.isfile(entrada):
+            fuentes.append(entrada)
+        else:
+            fuentes.extend(sorted(glob.glob(entrada, recursive=True)))
+    unicos = {}
+    for fuente in fuentes:
+        unicos.setdefault(os.path.abspath(fuente), fuente)
+    return list(unicos.values())
+
+def directorios_salida(fuentes, raiz):
+    # Un directorio por archivo fuente; los nombres repetidos se numeran
+    # con el primer sufijo libre (a, a_2, a_3...), sin chocar con fuentes
+    # que ya se llaman así. Se comparan sin distinguir mayúsculas, porque
+    # en Windows y macOS 'A' y 'a' son el mismo directorio.
+    asignados = set()
+    siguiente = {}
+    directorios = []
+    for fuente in fuentes:
+        base = os.path.splitext(os.path.basename(fuente))[0]
+        nombre = base
+        if nombre.casefold() in asignados:
+            numero = siguiente.get(base.casefold(), 2)
+            while f"{base}_{numero}".casefold() in asignados:
+                numero += 1
+            siguiente[base.casefold()] = numero + 1
+            nombre = f"{base}_{numero}"
+        asignados.add(nombre.casefold())
+        directorios.append(os.path.join(raiz, nombre))
+    return directorios
+
+def compilar_lote(fuentes, raiz_salida, procesos=None, informar=print, arbol_binario=False,
+                  directorio_cache=None, limite_cache=None, estadisticas=False,
+                  optimizaciones=None, limite_errores=None):
+    resumen = {'archivos': 0, 'fallidos': 0, 'tokens': 0,
+               'errores_lexicos': 0, 'errores_sintacticos': 0, 'errores_semanticos': 0,
+               'desde_cache': 0}
+    inicio = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_trabajador,
+                             initargs=(arbol_binario, directorio_cache, limite_cache,
+                                       estadisticas, optimizaciones,
+                                       limite_errores)) as ejecutor:
+        pendientes = [ejecutor.submit(_compilar, fuente, destino)
+                      for fuente, destino in zip(fuentes, directorios_salida(fuentes, raiz_salida))]
+        # Los resultados se informan según terminan, sin esperar al más lento
+        for futuro in as_completed(pendientes):
+            resultado = futuro.result()
+            resumen['archivos'] += 1
+            resumen['fallidos'] += not resultado['ok']
+            for clave in ('tokens', 'errores_lexicos', 'errores_sintacticos',
+                          'errores_semanticos', 'desde_cache'):
+                resumen[clave] += resultado[clave]
+            if informar:
+                estado = '✓' if resultado['ok'] else '✗'
+                informar(f"{estado} {resultado['archivo']} -> {resultado['salida']} "
+                         f"({resultado['errores_lexicos']} léxicos, "
+                         f"{resultado['errores_sintacticos']} sintácticos, "
+                         f"{resultado['errores_semanticos']} semánticos, "
+                         f"{resultado['segundos']:.3f} s"
+                         + (", caché)" if resultado['desde_cache'] else ")")
+                         + ('' if resultado['ok'] else f" {resultado['mensaje']}"))
+
+    resumen['segundos'] = time.perf_counter() - inicio
+    resumen['archivos_por_segundo'] = resumen['archivos'] / resumen['segundos'] if resumen['segundos'] else 0.0
+    return resumen
+
+def main(argv=None):
+    argumentos = argparse.ArgumentParser(description="Compila archivos fuente pf2024 en paralelo")
+    argumentos.add_argument('entradas', nargs='+', help="archivos, directorios o patrones glob de .txt")
+    argumentos.add_argument('-o', '--salida', default='salida',
+                            help="directorio raíz de salida (uno por archivo fuente)")
+    argumentos.add_argument('-j', '--procesos', type=int, default=None,
+                            help="número de procesos (por defecto, todos los núcleos)")
+    argumentos.add_argument('--arbol-binario', action='store_true',
+                            help="escribe también el árbol en formato binario (progfte.arbb)")
+    argumentos.add_argument('--cache', action='store_true',
+                            help="reutiliza resultados de fuentes ya compiladas")
+    argumentos.add_argument('--cache-dir', default=None,
+                            help="directorio de la caché de resultados (implica --cache)")
+    argumentos.add_argument('--cache-limite', type=int, default=512,
+                            help="tamaño máximo de la caché en MB (por defecto, 512)")
+    argumentos.add_argument('--estadisticas', action='store_true',
+                            help="mide cada fase y escribe progfte.estadisticas.json por archivo")
+    argumentos.add_argument('-O', '--optimizar', action='store_true',
+                            help="optimiza el árbol antes de escribirlo (todos los pases)")
+    argumentos.add_argument('--pases', default=None,
+                            help="pases de optimización separados por comas (implica -O): "
+                                 "plegado, almacenes_muertos, subexpresiones")
+    argumentos.add_argument('--limite-errores', type=int, default=None,
+                            help="abandona un archivo al llegar a ese número de errores sintácticos")
+    args = argumentos.parse_args(argv)
+
+    fuentes = buscar_fuentes(args.entradas)
+    if not fuentes:
+        print("No se encontraron archivos fuente", file=sys.stderr)
+        return 2
+
+    pases = args.pases.split(',') if args.pases else args.optimizar
+    if args.pases:
+        from optimizador import PASES
+        desconocidos = [pase for pase in pases if pase not in PASES]
+        if desconocidos:
+            print(f"Pases de optimización desconocidos: {', '.join(desconocidos)}", file=sys.stderr)
+            return 2
+
+    directorio_cache = args.cache_dir
+    if args.cache and directorio_cache is None:
+        import Compilador
+        directorio_cache = os.path.join(Compilador.DIRECTORIO_CACHE, 'resultados')
+
+    resumen = compilar_lote(fuentes, args.salida, args.procesos, arbol_binario=args.arbol_binario,
+                            directorio_cache=directorio_cache,
+                            limite_cache=args.cache_limite * 1024 * 1024,
+                            estadisticas=args.estadisticas,
+                            optimizaciones=pases,
+                            limite_errores=args.limite_errores)
+    print(f"\n{resumen['archivos']} archivos en {resumen['segundos']:.2f} s "
+          f"({resumen['archivos_por_segundo']:.1f} archivos/s), "
+          f"{resumen['tokens']} tokens, "
+          f"{resumen['errores_lexicos']} errores léxicos, "
+          f"{resumen['errores_sintacticos']} errores sintácticos, "
+          f"{resumen['errores_semanticos']} errores semánticos, "
+          f"{resumen['desde_cache']} desde caché, "
+          f"{resumen['fallidos']} fallidos")
+    return 1 if resumen['fallidos'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,435 @@
+import argparse
+import itertools
+import marshal
+import operator
+import os
+import sys
+from array import array
+
+# ----------------------------
+# Ejecución de programas pf2024: código de bytes y máquina virtual
+#
+# El árbol sintáctico se traduce a instrucciones de tamaño fijo
+# (operación, destino, a, b), como tuplas o en un array de enteros. Los
+# operandos son índices de una sola memoria de casillas: variables y
+# constantes (enteras y de cadena) en orden de aparición, y al final los
+# temporales, con índices negativos (-1, -2, ...).
+#
+# Las constantes se cargan una vez al iniciar la máquina, así que cada
+# operación binaria es una sola instrucción que lee y escribe casillas,
+# y la última operación de una asignación escribe directo en la variable.
+# El lenguaje no tiene saltos: el programa se ejecuta de principio a fin
+# y cada instrucción una sola vez, así que la traducción cuenta tanto como
+# la ejecución. Por eso el código de bytes se guarda en la caché: al
+# volver a ejecutar una fuente sin cambios no se analiza ni se traduce.
+# ----------------------------
+
+SUMA, RESTA, MULTIPLICACION, DIVISION, MOVER, LEER, IMPRIMIR = range(7)
+
+NOMBRES_OPERACION = ('SUMA', 'RESTA', 'MULTIPLICACION', 'DIVISION', 'MOVER', 'LEER', 'IMPRIMIR')
+OPERACIONES_BINARIAS = {'+': SUMA, '-': RESTA, '*': MULTIPLICACION, '/': DIVISION}
+VALOR_INICIAL = {'int': 0, 'Cad': '', 'Bool': False}
+
+class ErrorEjecucion(Exception):
+    pass
+
+def dividir(a, b):
+    # División entera truncada hacia cero (la de Python redondea hacia abajo)
+    if b == 0:
+        raise ErrorEjecucion("División entre cero")
+    cociente = a // b
+    return cociente + 1 if cociente < 0 and cociente * b != a else cociente
+
+class CodigoBytes:
+    # Las instrucciones se guardan como lista de tuplas (lo que recorre la
+    # máquina) o como array de enteros (compacto); cada forma se arma a
+    # partir de la otra la primera vez que se pide
+    def __init__(self, instrucciones=None):
+        self._decodificado = instrucciones
+        self._codigo = array('i') if instrucciones is None else None
+        self.iniciales = []       # Valor inicial de cada casilla
+        self.variables = {}       # nombre -> casilla
+        self.tipos = {}           # casilla -> tipo declarado ('int', 'Cad', 'Bool')
+        self.enteros = {}         # valor -> casilla
+        self.cadenas = {}         # valor -> casilla
+        self.temporales = 0
+        self._nombres = None
+
+    @property
+    def codigo(self):
+        if self._codigo is None:
+            self._codigo = array('i', itertools.chain.from_iterable(self._decodificado))
+        return self._codigo
+
+    def __len__(self):
+        if self._decodificado is not None:
+            return len(self._decodificado)
+        return len(self._codigo) // 4
+
+    def instrucciones(self):
+        if self._decodificado is not None:
+            return iter(self._decodificado)
+        it = iter(self._codigo)
+        return zip(it, it, it, it)
+
+    def decodificado(self):
+        # Lista de tuplas para la máquina virtual (recorrerla es más rápido
+        # que leer el array cada vez)
+        if self._decodificado is None:
+            self._decodificado = list(self.instrucciones())
+        return self._decodificado
+
+    def memoria_inicial(self):
+        return self.iniciales + [None] * self.temporales
+
+    def nombre_casilla(self, casilla):
+        if casilla < 0:
+            return f"t{-casilla - 1}"
+        if self._nombres is None:
+            self._nombres = {c: v for v, c in self.variables.items()}
+        return self._nombres.get(casilla) or repr(self.iniciales[casilla])
+
+    def instruccion_texto(self, op, d, a, b):
+        nombre = self.nombre_casilla
+        if op == LEER:
+            operandos = nombre(d)
+        elif op == IMPRIMIR:
+            operandos = nombre(a)
+        elif op == MOVER:
+            operandos = f"{nombre(d)}, {nombre(a)}"
+        else:
+            operandos = f"{nombre(d)}, {nombre(a)}, {nombre(b)}"
+        return f"{NOMBRES_OPERACION[op]:<15} {operandos}"
+
+    def desensamblar(self):
+        return '\n'.join(f"{i:>6} {self.instruccion_texto(*instruccion)}"
+                         for i, instruccion in enumerate(self.instrucciones()))
+
+# ----------------------------
+# Traducción del árbol a código de bytes
+# ----------------------------
+
+class _Traductor:
+    # Una sola pasada sobre el árbol. Las instrucciones se emiten como
+    # tuplas en la lista que recorre la máquina virtual (el array solo se
+    # arma si se pide). En pf2024 cada instrucción se ejecuta una sola
+    # vez, así que traducir debe costar poco más que recorrer el árbol.
+    def __init__(self):
+        self.emitidas = []
+        self.resultado = CodigoBytes(self.emitidas)
+        self.operacion = self._crear_operacion()
+
+    def variable(self, nombre, tipo=None):
+        resultado = self.resultado
+        casilla = resultado.variables.get(nombre)
+        if casilla is None:
+            casilla = resultado.variables[nombre] = len(resultado.iniciales)
+            resultado.iniciales.append(VALOR_INICIAL.get(tipo, 0))
+        if tipo is not None and casilla not in resultado.tipos:
+            resultado.tipos[casilla] = tipo
+            resultado.iniciales[casilla] = VALOR_INICIAL[tipo]
+        return casilla
+
+    def constante(self, valor):
+        resultado = self.resultado
+        tabla = resultado.cadenas if isinstance(valor, str) else resultado.enteros
+        casilla = tabla.get(valor)
+        if casilla is None:
+            casilla = tabla[valor] = len(resultado.iniciales)
+            resultado.iniciales.append(valor)
+        return casilla
+
+    def _crear_operacion(self):
+        # Camino caliente: recursiva, con las tablas en variables locales y
+        # las hojas resueltas en el nodo padre (sin llamada por hoja). El
+        # resultado del nodo en la posición k de la pila de evaluación va
+        # al temporal k (casilla -k-1).
+        variables, enteros = self.resultado.variables, self.resultado.enteros
+        variable, constante = self.variable, self.constante
+        emitir = self.emitidas.append
+        codigos = OPERACIONES_BINARIAS
+
+        def operacion(nodo, k):
+            try:
+                codigo = codigos[nodo.tipo]
+            except KeyError:
+                raise ValueError(f"Nodo de expresión desconocido: {nodo.tipo}") from None
+            izquierda, derecha = nodo.hijos
+            tipo = izquierda.tipo
+            if tipo == 'ID':
+                a = variables.get(izquierda.valor)
+                if a is None:
+                    a = variable(izquierda.valor)
+            elif tipo == 'NUMERO':
+                a = enteros.get(izquierda.valor)
+                if a is None:
+                    a = constante(izquierda.valor)
+            else:
+                a = operacion(izquierda, k)
+            tipo = derecha.tipo
+            if tipo == 'ID':
+                b = variables.get(derecha.valor)
+                if b is None:
+                    b = variable(derecha.valor)
+            elif tipo == 'NUMERO':
+                b = enteros.get(derecha.valor)
+                if b is None:
+                    b = constante(derecha.valor)
+            else:
+                b = operacion(derecha, k + 1)
+            temporal = -k - 1
+            emitir((codigo, temporal, a, b))
+            return temporal
+        return operacion
+
+    def _operacion_iterativa(self, nodo):
+        # Igual que operacion(), con una pila propia, para expresiones más
+        # anidadas que el límite de recursión. En la pila de pendientes, un
+        # entero es la operación de un nodo cuyos operandos ya se evaluaron.
+        emitir = self.emitidas.append
+        valores = []
+        pendientes = [nodo]
+        while pendientes:
+            nodo = pendientes.pop()
+            if type(nodo) is int:
+                b = valores.pop()
+                temporal = -len(valores)
+                emitir((nodo, temporal, valores[-1], b))
+                valores[-1] = temporal
+                continue
+            tipo = nodo.tipo
+            if tipo == 'ID':
+                valores.append(self.variable(nodo.valor))
+            elif tipo == 'NUMERO':
+                valores.append(self.constante(nodo.valor))
+            elif tipo in OPERACIONES_BINARIAS:
+                izquierda, derecha = nodo.hijos
+                pendientes += (OPERACIONES_BINARIAS[tipo], derecha, izquierda)
+            else:
+                raise ValueError(f"Nodo de expresión desconocido: {tipo}")
+        return valores.pop()
+
+    def expresion(self, nodo, destino=None):
+        # Devuelve la casilla con el valor (`destino`, si se indica: la
+        # última operación escribe directo en ella)
+        emitidas = self.emitidas
+        tipo = nodo.tipo
+        if tipo == 'ID':
+            casilla = self.variable(nodo.valor)
+        elif tipo == 'NUMERO':
+            casilla = self.constante(nodo.valor)
+        else:
+            inicio = len(emitidas)
+            try:
+                casilla = self.operacion(nodo, 0)
+            except RecursionError:
+                del emitidas[inicio:]
+                casilla = self._operacion_iterativa(nodo)
+        if destino is not None:
+            if casilla < 0:
+                codigo, _, a, b = emitidas[-1]
+                emitidas[-1] = (codigo, destino, a, b)
+            else:
+                emitidas.append((MOVER, destino, casilla, 0))
+            casilla = destino
+        return casilla
+
+    def declaraciones(self, nodo):
+        for declaracion in nodo.hijos:
+            if declaracion.tipo == 'ERROR':
+                continue  # Declaración que el parser no reconoció
+            tipo = declaracion.hijos[0].valor
+            if declaracion.tipo == 'DECLARACION':
+                for id_ in declaracion.hijos[1].hijos:
+                    self.variable(id_.valor, tipo)
+            else:
+                _, id_, expresion = declaracion.hijos
+                self.expresion(expresion, self.variable(id_.valor, tipo))
+
+    def instrucciones(self, nodos):
+        # Una vuelta por instrucción, sin llamadas por nodo salvo en las
+        # expresiones
+        variables = self.resultado.variables
+        variable, expresion, constante = self.variable, self.expresion, self.constante
+        emitir = self.emitidas.append
+        for nodo in nodos:
+            tipo = nodo.tipo
+            if tipo == 'ASIGNACION':
+                id_, valor = nodo.hijos
+                destino = variables.get(id_.valor)
+                expresion(valor, variable(id_.valor) if destino is None else destino)
+            elif tipo == 'LEER':
+                nombre = nodo.hijos[0].valor
+                casilla = variables.get(nombre)
+                emitir((LEER, variable(nombre) if casilla is None else casilla, 0, 0))
+            elif tipo == 'IMPRIMIR':
+                hijo = nodo.hijos[0]
+                if hijo.tipo == 'TEXTO':
+                    emitir((IMPRIMIR, 0, constante(hijo.valor), 0))
+                else:
+                    casilla = variables.get(hijo.valor)
+                    emitir((IMPRIMIR, 0, variable(hijo.valor) if casilla is None else casilla, 0))
+            elif tipo == 'ERROR':
+                pass  # Instrucción que el parser no reconoció
+            else:
+                raise ValueError(f"Instrucción desconocida: {tipo}")
+
+    def programa(self, arbol):
+        for seccion in arbol.hijos:
+            if seccion.tipo == 'DECLARACIONES':
+                self.declaraciones(seccion)
+            elif seccion.tipo == 'BLOQUE':
+                for instrucciones in seccion.hijos:
+                    self.instrucciones(instrucciones.hijos)
+        # Los temporales solo aparecen como operandos después de escribirse
+        destinos = map(operator.itemgetter(1), self.emitidas)
+        self.resultado.temporales = -min(0, min(destinos, default=0))
+        return self.resultado
+
+def compilar_bytecode(arbol):
+    if arbol is None:
+        raise ValueError("No hay árbol sintáctico que compilar")
+    return _Traductor().programa(arbol)
+
+# ----------------------------
+# Código de bytes guardado
+#
+# marshal solo admite enteros, cadenas y contenedores (no ejecuta nada al
+# leer) y se lee en C; las instrucciones van como los bytes del array.
+# ----------------------------
+
+def serializar_bytecode(programa):
+    return marshal.dumps((programa.codigo.tobytes(), programa.iniciales, programa.variables,
+                          programa.tipos, programa.enteros, programa.cadenas,
+                          programa.temporales))
+
+def deserializar_bytecode(datos):
+    programa = CodigoBytes()
+    (codigo, programa.iniciales, programa.variables, programa.tipos, programa.enteros,
+     programa.cadenas, programa.temporales) = marshal.loads(datos)
+    programa.codigo.frombytes(codigo)
+    return programa
+
+def traducir_archivo(ruta, cache=None):
+    # Devuelve (programa, errores) de una fuente. Con `cache` (una
+    # CacheResultados) el código de bytes y los errores de una fuente ya
+    # traducida se leen sin volver a analizarla.
+    import Compilador
+    with Compilador.proyectar_archivo(ruta) as datos:
+        if cache is not None:
+            clave = cache.clave(datos, 'bytecode')
+            entrada = cache.obtener(clave)
+            if entrada is not None:
+                return deserializar_bytecode(entrada['codigo']), entrada['errores']
+        sesion = Compilador.SesionCompilador(salida=Compilador.SalidaMemoria())
+        sesion.analizar_bloques(Compilador.bloques_mapeados(datos))
+    errores = {'lexicos': sesion.errores_lexicos, 'sintacticos': sesion.errores_sintacticos,
+               'semanticos': sesion.errores_semanticos}
+    programa = compilar_bytecode(sesion.arbol)
+    if cache is not None:
+        cache.guardar(clave, {'codigo': serializar_bytecode(programa), 'errores': errores})
+    return programa, errores
+
+# ----------------------------
+# Máquina virtual
+# ----------------------------
+
+def _leer_consola():
+    return input()
+
+class MaquinaVirtual:
+    # `entrada()` devuelve el texto (o número) de cada leerdig y
+    # `salida(valor)` recibe cada impcad; por omisión, la consola
+    def __init__(self, entrada=None, salida=None):
+        self.entrada = entrada or _leer_consola
+        self.salida = salida or print
+        self.memoria = []
+
+    def ejecutar(self, programa):
+        self.memoria = m = programa.memoria_inicial()
+        entrada, salida = self.entrada, self.salida
+        op = d = a = b = None
+        try:
+            # Las operaciones se comparan con sus números literales (más
+            # rápido que leer las constantes globales en cada instrucción)
+            for op, d, a, b in programa.decodificado():
+                if op == 0:    # SUMA
+                    m[d] = m[a] + m[b]
+                elif op == 1:  # RESTA
+                    m[d] = m[a] - m[b]
+                elif op == 2:  # MULTIPLICACION
+                    m[d] = m[a] * m[b]
+                elif op == 3:  # DIVISION, dividir() en línea
+                    x = m[a]
+                    y = m[b]
+                    q = x // y
+                    m[d] = q + 1 if q < 0 and q * y != x else q
+                elif op == 4:  # MOVER
+                    m[d] = m[a]
+                elif op == 5:  # LEER
+                    m[d] = int(entrada())
+                else:          # IMPRIMIR
+                    salida(m[a])
+        except ZeroDivisionError:
+            raise ErrorEjecucion(f"{programa.instruccion_texto(op, d, a, b)}: "
+                                 "División entre cero") from None
+        except (TypeError, ValueError) as e:
+            raise ErrorEjecucion(f"{programa.instruccion_texto(op, d, a, b)}: {e}") from e
+        return self.variables(programa)
+
+    def variables(self, programa):
+        return {nombre: self.memoria[casilla] for nombre, casilla in programa.variables.items()}
+
+def ejecutar_programa(arbol, entrada=None, salida=None):
+    return MaquinaVirtual(entrada, salida).ejecutar(compilar_bytecode(arbol))
+
+# ----------------------------
+# Ejecución desde la línea de comandos
+#
+#   python maquina_virtual.py programa.txt [--desensamblar] [--sin-cache]
+# ----------------------------
+
+def main(argv=None):
+    argumentos = argparse.ArgumentParser(description="Ejecuta un programa pf2024")
+    argumentos.add_argument('programa', help="archivo fuente")
+    argumentos.add_argument('--desensamblar', action='store_true',
+                            help="muestra el código de bytes en lugar de ejecutarlo")
+    argumentos.add_argument('--sin-cache', action='store_true',
+                            help="analiza y traduce siempre, sin guardar el código de bytes")
+    argumentos.add_argument('--cache-dir', default=None,
+                            help="directorio de la caché de código de bytes")
+    args = argumentos.parse_args(argv)
+
+    cache = None
+    if not args.sin_cache:
+        import Compilador
+        from cache_resultados import CacheResultados
+        cache = CacheResultados(args.cache_dir or os.path.join(Compilador.DIRECTORIO_CACHE,
+                                                               'bytecode'),
+                                version=Compilador.version_compilador())
+    try:
+        programa, errores = traducir_archivo(args.programa, cache)
+    except (OSError, ValueError) as e:
+        print(e, file=sys.stderr)
+        return 1
+    # Los diagnósticos van a stderr para no mezclarse con impcad
+    for error in itertools.chain(errores['lexicos'], errores['sintacticos'],
+                                 errores['semanticos']):
+        print(f"Línea {error['line']}: {error['msg']} ({error['value']!r})", file=sys.stderr)
+    if errores['lexicos'] or errores['sintacticos'] or errores['semanticos']:
+        print(f"{len(errores['lexicos'])} errores léxicos, "
+              f"{len(errores['sintacticos'])} sintácticos y "
+              f"{len(errores['semanticos'])} semánticos; se ejecuta lo reconocido",
+              file=sys.stderr)
+    if args.desensamblar:
+        print(programa.desensamblar())
+        return 0
+    try:
+        MaquinaVirtual().ejecutar(programa)
+    except ErrorEjecucion as e:
+        print(f"Error de ejecución: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
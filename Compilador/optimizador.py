@@ -0,0 +1,259 @@
+import operator
+
+from Compilador import Nodo, contar_nodos, sin_recolector
+from maquina_virtual import dividir
+
+# ----------------------------
+# Optimización del árbol sintáctico
+#
+# Pases que modifican el árbol en su lugar, entre el análisis sintáctico
+# y la generación de salidas o de código de bytes:
+#
+#   plegado            evalúa las operaciones entre constantes
+#   almacenes_muertos  quita las asignaciones sobrescritas antes de leerse
+#   subexpresiones     calcula una sola vez las subexpresiones repetidas
+#                      del bloque, en variables temporales '$t0', '$t1', ...
+#
+# Los pases se ejecutan siempre en ese orden (los que estén activos) y
+# cada uno informa cuántos nodos eliminó.
+# ----------------------------
+
+PASES = ('plegado', 'almacenes_muertos', 'subexpresiones')
+
+# '$' no puede aparecer en un identificador del lenguaje
+PREFIJO_TEMPORAL = '$t'
+
+OPERACIONES = {'+': operator.add, '-': operator.sub, '*': operator.mul, '/': dividir}
+
+def _recorrer(nodo):
+    pendientes = [nodo]
+    while pendientes:
+        nodo = pendientes.pop()
+        yield nodo
+        pendientes.extend(nodo.hijos)
+
+def _instrucciones(arbol):
+    # Lista (modificable) de instrucciones del bloque, o None
+    for seccion in arbol.hijos:
+        if seccion.tipo == 'BLOQUE' and seccion.hijos:
+            return seccion.hijos[0].hijos
+    return None
+
+def _expresiones(arbol):
+    # (padre, índice) de cada expresión del programa
+    for seccion in arbol.hijos:
+        if seccion.tipo == 'DECLARACIONES':
+            for declaracion in seccion.hijos:
+                if declaracion.tipo == 'DECLARACION_CON_INICIALIZACION':
+                    yield declaracion, 2
+        elif seccion.tipo == 'BLOQUE':
+            for instruccion in _instrucciones(arbol) or ():
+                if instruccion.tipo == 'ASIGNACION':
+                    yield instruccion, 1
+
+# ----------------------------
+# Plegado de constantes
+# ----------------------------
+
+def plegar_constantes(arbol):
+    plegadas = 0
+    for padre, indice in _expresiones(arbol):
+        # Postorden: los operandos se pliegan antes que su operación
+        pendientes = [(padre, indice, False)]
+        while pendientes:
+            padre, indice, listo = pendientes.pop()
+            nodo = padre.hijos[indice]
+            operacion = OPERACIONES.get(nodo.tipo)
+            if operacion is None:
+                continue
+            if not listo:
+                pendientes += ((padre, indice, True), (nodo, 1, False), (nodo, 0, False))
+                continue
+            izquierda, derecha = nodo.hijos
+            if izquierda.tipo != 'NUMERO' or derecha.tipo != 'NUMERO':
+                continue
+            if nodo.tipo == '/' and derecha.valor == 0:
+                continue  # El error se produce al ejecutar
+            padre.hijos[indice] = Nodo('NUMERO', valor=operacion(izquierda.valor, derecha.valor))
+            plegadas += 1
+    return {'plegadas': plegadas}
+
+# ----------------------------
+# Eliminación de almacenes muertos
+# ----------------------------
+
+def _puede_fallar(expresion):
+    # Una división entre algo que no es una constante distinta de cero.
+    # (Los errores de tipo los informa el análisis semántico.)
+    for nodo in _recorrer(expresion):
+        if nodo.tipo == '/':
+            divisor = nodo.hijos[1]
+            if divisor.tipo != 'NUMERO' or divisor.valor == 0:
+                return True
+    return False
+
+def eliminar_almacenes_muertos(arbol):
+    instrucciones = _instrucciones(arbol)
+    if not instrucciones:
+        return {'asignaciones_eliminadas': 0}
+
+    # De atrás hacia adelante: `sobrescritas` son las variables que se
+    # vuelven a asignar antes de cualquier lectura
+    sobrescritas = set()
+    conservadas = []
+    for instruccion in reversed(instrucciones):
+        tipo = instruccion.tipo
+        if tipo == 'ASIGNACION':
+            destino, expresion = instruccion.hijos
+            if destino.valor in sobrescritas and not _puede_fallar(expresion):
+                continue
+            sobrescritas.add(destino.valor)
+            # Las lecturas de la expresión ocurren antes de la asignación
+            sobrescritas.difference_update(nodo.valor for nodo in _recorrer(expresion)
+                                           if nodo.tipo == 'ID')
+        elif tipo == 'LEER':
+            sobrescritas.add(instruccion.hijos[0].valor)
+        elif tipo == 'IMPRIMIR':
+            if instruccion.hijos[0].tipo == 'ID':
+                sobrescritas.discard(instruccion.hijos[0].valor)
+        else:
+            sobrescritas.clear()  # Instrucción desconocida: puede leer cualquier variable
+        conservadas.append(instruccion)
+
+    eliminadas = len(instrucciones) - len(conservadas)
+    conservadas.reverse()
+    instrucciones[:] = conservadas
+    return {'asignaciones_eliminadas': eliminadas}
+
+# ----------------------------
+# Subexpresiones comunes
+#
+# Numeración de valores: dos subexpresiones reciben el mismo número si
+# tienen la misma forma y leen las mismas versiones de sus variables (cada
+# asignación o leerdig crea una versión nueva). Un grupo de apariciones
+# se reemplaza por una temporal asignada justo antes de la instrucción de
+# la primera aparición, si eso deja menos nodos en el árbol.
+# ----------------------------
+
+def _numerar(padre, indice, posicion, numeros, versiones, apariciones):
+    # Numera la expresión padre.hijos[indice]. `apariciones` guarda, por
+    # número, la aparición (padre, índice, nodo, posición) de cada operación,
+    # o la lista de ellas cuando hay más de una.
+    resultados = []
+    pendientes = [(padre, indice, False)]
+    while pendientes:
+        padre, indice, listo = pendientes.pop()
+        nodo = padre.hijos[indice]
+        tipo = nodo.tipo
+        if tipo == 'ID':
+            clave = (nodo.valor, versiones.get(nodo.valor, 0))
+        elif tipo == 'NUMERO':
+            clave = nodo.valor
+        elif tipo in OPERACIONES:
+            if not listo:
+                pendientes += ((padre, indice, True), (nodo, 1, False), (nodo, 0, False))
+                continue
+            derecha = resultados.pop()
+            numero = numeros.setdefault((tipo, resultados.pop(), derecha), len(numeros))
+            aparicion = (padre, indice, nodo, posicion)
+            previa = apariciones.get(numero)
+            if previa is None:
+                apariciones[numero] = aparicion
+            elif previa.__class__ is list:
+                previa.append(aparicion)
+            else:
+                apariciones[numero] = [previa, aparicion]
+            resultados.append(numero)
+            continue
+        else:
+            clave = nodo  # Nodo desconocido: nunca coincide con otro
+        resultados.append(numeros.setdefault(clave, len(numeros)))
+
+def eliminar_subexpresiones(arbol):
+    instrucciones = _instrucciones(arbol)
+    if not instrucciones:
+        return {'subexpresiones': 0, 'apariciones': 0}
+
+    numeros, versiones, apariciones = {}, {}, {}
+    for posicion, instruccion in enumerate(instrucciones):
+        if instruccion.tipo == 'ASIGNACION':
+            _numerar(instruccion, 1, posicion, numeros, versiones, apariciones)
+        if instruccion.tipo in ('ASIGNACION', 'LEER'):
+            destino = instruccion.hijos[0].valor
+            versiones[destino] = versiones.get(destino, 0) + 1
+
+    # Las temporales de una optimización anterior (todas asignadas, así que
+    # están en `versiones`) no se reutilizan
+    siguiente_temporal = 0
+    for nombre in versiones:
+        sufijo = nombre[len(PREFIJO_TEMPORAL):]
+        if nombre.startswith(PREFIJO_TEMPORAL) and sufijo.isdigit():
+            siguiente_temporal = max(siguiente_temporal, int(sufijo) + 1)
+    del numeros, versiones
+
+    # Primero las más grandes: al reemplazarlas desaparecen las repetidas
+    # que contienen (salvo las de la primera aparición, que se conserva)
+    grupos = [(sum(1 for _ in _recorrer(lista[0][2])), lista)
+              for lista in apariciones.values() if lista.__class__ is list]
+    grupos.sort(key=lambda grupo: grupo[0], reverse=True)
+    del apariciones
+
+    eliminados = set()
+    insertar = {}
+    reemplazadas = 0
+    for tamano, lista in grupos:
+        vivas = [aparicion for aparicion in lista if id(aparicion[2]) not in eliminados]
+        k = len(vivas)
+        # k apariciones de `tamano` nodos pasan a k ID más ASIGNACION, ID y la expresión
+        if k < 2 or k * tamano <= k + tamano + 2:
+            continue
+        nombre = f"{PREFIJO_TEMPORAL}{siguiente_temporal}"
+        siguiente_temporal += 1
+        for padre, indice, _, _ in vivas:
+            padre.hijos[indice] = Nodo('ID', valor=nombre)
+        for _, _, nodo, _ in vivas[1:]:
+            eliminados.update(map(id, _recorrer(nodo)))
+        _, _, nodo, posicion = vivas[0]
+        # Las temporales de subexpresiones más pequeñas van antes
+        insertar.setdefault(posicion, []).insert(
+            0, Nodo('ASIGNACION', [Nodo('ID', valor=nombre), nodo]))
+        reemplazadas += k
+
+    if insertar:
+        nuevas = []
+        for posicion, instruccion in enumerate(instrucciones):
+            nuevas.extend(insertar.get(posicion, ()))
+            nuevas.append(instruccion)
+        instrucciones[:] = nuevas
+    return {'subexpresiones': sum(map(len, insertar.values())), 'apariciones': reemplazadas}
+
+# ----------------------------
+# Ejecución de los pases
+# ----------------------------
+
+FUNCIONES_PASE = {
+    'plegado': plegar_constantes,
+    'almacenes_muertos': eliminar_almacenes_muertos,
+    'subexpresiones': eliminar_subexpresiones,
+}
+
+def optimizar(arbol, pases=PASES):
+    # Devuelve {pase: estadísticas}; `pases` elige cuáles se ejecutan
+    desconocidos = set(pases) - set(PASES)
+    if desconocidos:
+        raise ValueError(f"Pases de optimización desconocidos: {', '.join(sorted(desconocidos))}")
+    estadisticas = {}
+    if arbol is None:
+        return estadisticas
+    nodos = contar_nodos(arbol)
+    for nombre in PASES:
+        if nombre not in pases:
+            continue
+        # Los pases crean millones de tuplas sin ciclos
+        with sin_recolector():
+            datos = FUNCIONES_PASE[nombre](arbol)
+        restantes = contar_nodos(arbol)
+        datos.update(nodos_antes=nodos, nodos_despues=restantes, nodos_eliminados=nodos - restantes)
+        estadisticas[nombre] = datos
+        nodos = restantes
+    return estadisticas
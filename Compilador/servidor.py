@@ -0,0 +1,224 @@
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+# ----------------------------
+# Servidor de compilación (JSON por líneas)
+#
+# Cada línea de entrada es una petición:
+#   {"id": 1, "fuente": "pf2024 Ejem1 ..."}     texto del programa
+#   {"id": 2, "ruta": "pf2024.txt", "salida": "dir"}   archivo; "salida"
+#                                               escribe además progfte.*
+#   {"cancelar": 1}                             cancela una petición
+# Campos opcionales: "tokens" y "arbol" (true por defecto).
+#
+# Cada respuesta es una línea con el mismo "id" y "ok", más tokens,
+# errores_lexicos, errores_sintacticos, errores_semanticos y arbol, o
+# "error" (y "cancelado").
+#
+#   python servidor.py                  (stdin/stdout)
+#   python servidor.py --socket /tmp/compilador.sock
+#   python servidor.py --puerto 8765    (TCP en 127.0.0.1, p. ej. en Windows)
+# ----------------------------
+
+LIMITE_LINEA = 256 * 1024 * 1024
+
+_sesion = None
+
+def _iniciar_trabajador():
+    # Los procesos del pool mantienen el lexer y las tablas ya cargados
+    global _sesion
+    import Compilador
+    _sesion = Compilador.SesionCompilador(salida=Compilador.SalidaMemoria())
+
+def compilar_peticion(peticion):
+    # Devuelve la respuesta ya codificada como una línea JSON
+    import Compilador
+    try:
+        if 'fuente' in peticion:
+            _sesion.analizar(peticion['fuente'])
+        else:
+            _sesion.analizar_bloques(Compilador.bloques_archivo(peticion['ruta']))
+        if peticion.get('salida'):
+            _sesion.salida = Compilador.SalidaDirectorio(peticion['salida'])
+            _sesion.generar_archivos()
+
+        respuesta = {'id': peticion['id'], 'ok': True}
+        respuesta.update(_sesion.resultado(incluir_tokens=peticion.get('tokens', True)))
+        linea = json.dumps(respuesta, ensure_ascii=False)
+        if peticion.get('arbol', True):
+            linea = linea[:-1] + ', "arbol": ' + Compilador.arbol_a_json(_sesion.arbol) + '}'
+        return linea
+
+    except KeyError as e:
+        return _respuesta_error(peticion, f"Falta el campo {e}")
+    except Exception as e:
+        return _respuesta_error(peticion, f"Error: {str(e)}")
+
+def _respuesta_error(peticion, mensaje, **extra):
+    return json.dumps(dict({'id': peticion.get('id'), 'ok': False, 'error': mensaje}, **extra),
+                      ensure_ascii=False)
+
+class ServidorCompilacion:
+    def __init__(self, procesos=None, max_pendientes=None):
+        procesos = procesos or os.cpu_count() or 1
+        self.ejecutor = ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_trabajador)
+        # Peticiones admitidas a la vez; al llegar al límite se deja de leer
+        # la entrada y el cliente queda bloqueado (contrapresión)
+        self.cupos = asyncio.Semaphore(max_pendientes or 2 * procesos)
+        self._ids = itertools.count(1)
+
+    def cerrar(self):
+        self.ejecutor.shutdown(cancel_futures=True)
+
+    async def atender(self, lector, escritor):
+        en_curso = {}
+        tareas = set()
+        bloqueo_escritura = asyncio.Lock()
+
+        async def responder(linea):
+            async with bloqueo_escritura:
+                escritor.write(linea.encode('utf-8') + b'\n')
+                await escritor.drain()
+
+        async def procesar(peticion, futuro):
+            try:
+                respuesta = await futuro
+            except asyncio.CancelledError:
+                respuesta = _respuesta_error(peticion, "Petición cancelada", cancelado=True)
+            except Exception as e:
+                respuesta = _respuesta_error(peticion, f"Error: {str(e)}")
+            finally:
+                en_curso.pop(peticion['id'], None)
+            await responder(respuesta)
+
+        loop = asyncio.get_running_loop()
+        liberar = lambda _: loop.call_soon_threadsafe(self.cupos.release)
+
+        while True:
+            linea = await lector.readline()
+            if not linea:
+                break
+            if not linea.strip():
+                continue
+            try:
+                peticion = json.loads(linea)
+                if not isinstance(peticion, dict):
+                    raise ValueError("la petición debe ser un objeto JSON")
+            except ValueError as e:
+                await responder(_respuesta_error({}, f"Petición inválida: {e}"))
+                continue
+
+            if 'cancelar' in peticion:
+                # Si el análisis ya empezó en un proceso se descarta su resultado
+                futuro = en_curso.get(peticion['cancelar'])
+                if futuro is not None:
+                    futuro.cancel()
+                continue
+
+            peticion.setdefault('id', next(self._ids))
+            await self.cupos.acquire()
+            concurrente = self.ejecutor.submit(compilar_peticion, peticion)
+            # El cupo se devuelve cuando el proceso termina, no al cancelar:
+            # una petición que ya se está analizando sigue ocupándolo
+            concurrente.add_done_callback(liberar)
+            futuro = asyncio.wrap_future(concurrente)
+            en_curso[peticion['id']] = futuro
+            tarea = asyncio.create_task(procesar(peticion, futuro))
+            tareas.add(tarea)
+            tarea.add_done_callback(tareas.discard)
+
+        if tareas:
+            await asyncio.gather(*tareas, return_exceptions=True)
+
+# connect_read_pipe y connect_write_pipe solo aceptan tuberías, sockets y
+# terminales (y en Windows, ni eso): con archivos normales se lee y se
+# escribe en un hilo
+
+class _LectorHilo:
+    def __init__(self, flujo):
+        self.flujo = flujo
+
+    async def readline(self):
+        return await asyncio.get_running_loop().run_in_executor(None, self.flujo.readline)
+
+class _EscritorHilo:
+    def __init__(self, flujo):
+        self.flujo = flujo
+        self._pendiente = []
+
+    def write(self, datos):
+        self._pendiente.append(datos)
+
+    async def drain(self):
+        datos, self._pendiente = b''.join(self._pendiente), []
+        await asyncio.get_running_loop().run_in_executor(None, self._escribir, datos)
+
+    def _escribir(self, datos):
+        self.flujo.write(datos)
+        self.flujo.flush()
+
+async def _flujos_estandar():
+    loop = asyncio.get_running_loop()
+    lector = asyncio.StreamReader(limit=LIMITE_LINEA)
+    try:
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(lector), sys.stdin)
+    except (ValueError, OSError, NotImplementedError):
+        lector = _LectorHilo(sys.stdin.buffer)
+    try:
+        transporte, protocolo = await loop.connect_write_pipe(
+            asyncio.streams.FlowControlMixin, sys.stdout)
+    except (ValueError, OSError, NotImplementedError):
+        return lector, _EscritorHilo(sys.stdout.buffer)
+    escritor = asyncio.StreamWriter(transporte, protocolo, None, loop)
+    return lector, escritor
+
+async def servir(procesos=None, max_pendientes=None, socket=None, puerto=None):
+    servidor = ServidorCompilacion(procesos, max_pendientes)
+    try:
+        if socket is None and puerto is None:
+            lector, escritor = await _flujos_estandar()
+            await servidor.atender(lector, escritor)
+        else:
+            async def conexion(lector, escritor):
+                try:
+                    await servidor.atender(lector, escritor)
+                finally:
+                    escritor.close()
+
+            if socket is not None:
+                escucha = await asyncio.start_unix_server(conexion, path=socket, limit=LIMITE_LINEA)
+            else:
+                escucha = await asyncio.start_server(conexion, '127.0.0.1', puerto,
+                                                     limit=LIMITE_LINEA)
+            async with escucha:
+                await escucha.serve_forever()
+    finally:
+        servidor.cerrar()
+
+def main(argv=None):
+    argumentos = argparse.ArgumentParser(description="Servidor de compilación pf2024 (JSON por líneas)")
+    conexion = argumentos.add_mutually_exclusive_group()
+    conexion.add_argument('--socket', help="ruta del socket Unix (por defecto, stdin/stdout)")
+    conexion.add_argument('--puerto', type=int,
+                          help="puerto TCP en 127.0.0.1 (donde no hay sockets Unix)")
+    argumentos.add_argument('-j', '--procesos', type=int, default=None,
+                            help="procesos para el análisis (por defecto, todos los núcleos)")
+    argumentos.add_argument('--pendientes', type=int, default=None,
+                            help="máximo de peticiones en curso antes de dejar de leer")
+    args = argumentos.parse_args(argv)
+    if args.socket and not hasattr(asyncio, 'start_unix_server'):
+        argumentos.error("esta plataforma no tiene sockets Unix; use --puerto")
+
+    try:
+        asyncio.run(servir(args.procesos, args.pendientes, args.socket, args.puerto))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())